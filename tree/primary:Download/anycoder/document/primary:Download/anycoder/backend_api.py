@@ -31,6 +31,16 @@ from backend_models import (
 # Import project importer for importing from HF/GitHub
 from project_importer import ProjectImporter
 
+# One importer for all /api/import* requests, so its pooled HTTP client and caches are reused
+_IMPORTER = ProjectImporter()
+
+# Pre-load documentation for the docs-backed prompts (fetched concurrently; no longer done on import)
+try:
+    from backend_docs_manager import initialize_backend_docs
+    initialize_backend_docs()
+except ImportError:
+    print("[Startup] backend_docs_manager not available, skipping documentation preload")
+
 # Import system prompts from standalone backend_prompts.py
 # No dependencies on Gradio or heavy libraries
 print("[Startup] Loading system prompts from backend_prompts...")
@@ -38,16 +48,19 @@ print("[Startup] Loading system prompts from backend_prompts...")
 try:
     from backend_prompts import (
         HTML_SYSTEM_PROMPT,
-        TRANSFORMERS_JS_SYSTEM_PROMPT,
         STREAMLIT_SYSTEM_PROMPT,
         REACT_SYSTEM_PROMPT,
         REACT_FOLLOW_UP_SYSTEM_PROMPT,  # Import React followup prompt
+        get_transformersjs_system_prompt,  # Import the function to get dynamic transformers.js prompt
         get_gradio_system_prompt,  # Import the function to get dynamic prompt
         get_comfyui_system_prompt,  # Import the function to get dynamic ComfyUI prompt
         JSON_SYSTEM_PROMPT,
         DAGGR_SYSTEM_PROMPT,
-        GENERIC_SYSTEM_PROMPT
+        GENERIC_SYSTEM_PROMPT,
+        generic_system_prompt
     )
+    # Get the transformers.js system prompt (includes full transformers.js documentation)
+    TRANSFORMERS_JS_SYSTEM_PROMPT = get_transformersjs_system_prompt()
     # Get the Gradio system prompt (includes full Gradio 6 documentation)
     GRADIO_SYSTEM_PROMPT = get_gradio_system_prompt()
     # Get the ComfyUI system prompt (includes full ComfyUI documentation)
@@ -70,6 +83,9 @@ except Exception as e:
     COMFYUI_SYSTEM_PROMPT = "You are an expert ComfyUI developer. Generate clean, valid JSON workflows for ComfyUI based on the user's request. READ THE USER'S REQUEST CAREFULLY and create a workflow that matches their specific needs."
     JSON_SYSTEM_PROMPT = "You are an expert at generating JSON configurations. Create valid, well-structured JSON."
     GENERIC_SYSTEM_PROMPT = "You are an expert {language} developer. Create complete, working {language} applications."
+    
+    def generic_system_prompt(language: str) -> str:
+        return GENERIC_SYSTEM_PROMPT.format(language=language)
 
 print("[Startup] System prompts initialization complete")
 
@@ -192,6 +208,12 @@ async def startup_event():
     print("[Startup] ✅ Session cleanup task started")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the shared importer's pooled HTTP connections"""
+    _IMPORTER.close()
+
+
 # Pydantic models for request/response
 class CodeGenerationRequest(BaseModel):
     query: str
@@ -809,8 +831,8 @@ async def generate_code(
             # Fast system prompt lookup using cache
             system_prompt = SYSTEM_PROMPT_CACHE.get(language)
             if not system_prompt:
-                # Format generic prompt only if needed
-                system_prompt = GENERIC_SYSTEM_PROMPT.format(language=language)
+                # Generic prompt, cached per language
+                system_prompt = generic_system_prompt(language)
             
             # Detect if this is a followup request for React apps
             # Check if there's existing code in the conversation history
@@ -1569,8 +1591,7 @@ async def import_project(request: ImportRequest):
     - https://github.com/username/repo-name
     """
     try:
-        importer = ProjectImporter()
-        result = importer.import_from_url(request.url)
+        result = await _IMPORTER.aimport_from_url(request.url, prefer_local=request.prefer_local)
         
         # Handle model-specific prefer_local flag
         if request.prefer_local and result.get('metadata', {}).get('has_alternatives'):
@@ -1621,8 +1642,7 @@ async def import_project(request: ImportRequest):
 async def import_space(username: str, space_name: str):
     """Import a specific HuggingFace Space by username and space name"""
     try:
-        importer = ProjectImporter()
-        result = importer.import_space(username, space_name)
+        result = await _IMPORTER.aimport_space(username, space_name)
         return result
     except Exception as e:
         return {
@@ -1643,8 +1663,7 @@ async def import_model(path: str, prefer_local: bool = False):
     Example: /api/import/model/meta-llama/Llama-3.2-1B-Instruct
     """
     try:
-        importer = ProjectImporter()
-        result = importer.import_model(path, prefer_local=prefer_local)
+        result = await _IMPORTER.aimport_model(path, prefer_local=prefer_local)
         return result
     except Exception as e:
         return {
@@ -1661,8 +1680,7 @@ async def import_model(path: str, prefer_local: bool = False):
 async def import_github(owner: str, repo: str):
     """Import a GitHub repository by owner and repo name"""
     try:
-        importer = ProjectImporter()
-        result = importer.import_github_repo(owner, repo)
+        result = await _IMPORTER.aimport_github_repo(owner, repo)
         return result
     except Exception as e:
         return {
@@ -5,14 +5,23 @@ No Gradio dependencies - can be used in backend API.
 import os
 import re
 import json
+import string
 import uuid
 import tempfile
 import shutil
 import ast
-from typing import Dict, List, Optional, Tuple
+import traceback
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
-from huggingface_hub import HfApi
+from huggingface_hub import HfApi, CommitOperationAdd, duplicate_space, hf_hub_download
+from huggingface_hub import create_repo as hf_create_repo
 from backend_models import get_inference_client, get_real_model_id
 from backend_parsers import (
     parse_transformers_js_output,
@@ -27,6 +36,149 @@ from backend_parsers import (
     enforce_critical_versions
 )
 
+logger = logging.getLogger(__name__)
+
+# Shared worker pool for overlapping slow, independent deploy steps
+# (e.g. LLM requirements generation with HF repo creation)
+_DEPLOY_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="deploy")
+
+
+def _cancel_pending(future) -> None:
+    """Drop a background job whose result will never be collected (deploy bailed out early)"""
+    if future is not None:
+        future.cancel()
+
+
+class _SpaceNameCharTable(dict):
+    """str.translate table: allowed characters map to themselves, everything else to '-'"""
+    def __missing__(self, codepoint: int) -> int:
+        return ord('-')
+
+
+# requirements.txt contents repeat heavily (the same few templates), so pinning results are memoized
+_enforce_critical_versions_cached = functools.lru_cache(maxsize=64)(enforce_critical_versions)
+
+# Upper bound on generated code accepted for deploys/PRs, checked before any parsing allocates copies
+_MAX_CODE_BYTES = 4 * 1024 * 1024
+
+
+def _code_size_bytes(code: str) -> int:
+    """UTF-8 size of the code, as uploaded; a character count undercounts non-ASCII text up to 4x"""
+    return len(code.encode('utf-8', 'surrogatepass'))
+
+
+# Space-name sanitization (lowercase alphanumerics and single hyphens only)
+_SPACE_NAME_CHARS = _SpaceNameCharTable((ord(c), ord(c)) for c in string.ascii_lowercase + string.digits + '-')
+_SPACE_NAME_DASH_RUNS = re.compile(r'-+')
+
+# Upload error markers that retrying cannot fix (auth/permission failures), matched in one scan;
+# status codes are word-bounded so ids or sizes like "14030" do not count as a 403
+_FATAL_UPLOAD_ERROR_RE = re.compile(r'\b40[13]\b|Forbidden|Unauthorized|Authorization')
+
+# Duplication errors caused by unavailable hardware (e.g. zero-gpu), matched without lowercasing a copy
+_HARDWARE_ERROR_RE = re.compile(r'zero|hardware', re.IGNORECASE)
+
+
+def _is_fatal_upload_error(error_str: str) -> bool:
+    """Check if an upload error is a permission failure that should not be retried"""
+    return _FATAL_UPLOAD_ERROR_RE.search(error_str) is not None
+
+
+@functools.lru_cache(maxsize=32)
+def _get_api(token: str) -> HfApi:
+    """Get a shared HfApi client per token so HTTP connections are reused across calls"""
+    return HfApi(token=token)
+
+
+@functools.lru_cache(maxsize=32)
+def _username_for(token: str) -> str:
+    """
+    Resolve (and remember) the username behind a token - it never changes within a process.
+    Raises ValueError if the account has no name (failures are not cached by lru_cache).
+    """
+    user_info = _get_api(token).whoami()
+    username = user_info.get("name") or user_info.get("preferred_username")
+    if not username:
+        raise ValueError("Could not resolve a HuggingFace username from the token")
+    return username
+
+
+# (repo_id, token hash) -> (fetched_at, SpaceInfo); short-lived so repeated redesign/duplicate flows skip
+# the probe. Keyed by a hash so raw user tokens aren't kept in memory, and bounded for the multi-user server.
+_SPACE_INFO_CACHE: Dict[Tuple[str, str], Tuple[float, object]] = {}
+_SPACE_INFO_TTL_SECONDS = 60
+_SPACE_INFO_CACHE_MAX_ENTRIES = 256
+
+
+def _space_info_cached(repo_id: str, token: str):
+    """Fetch space_info for a repo, reusing a result fetched within the last _SPACE_INFO_TTL_SECONDS"""
+    key = (repo_id, hashlib.blake2b(token.encode('utf-8'), digest_size=16).hexdigest())
+    now = time.monotonic()
+    # Entries are stored in fetch order, so expired ones are always at the front
+    for stale_key, (fetched_at, _) in list(_SPACE_INFO_CACHE.items()):
+        if now - fetched_at < _SPACE_INFO_TTL_SECONDS:
+            break
+        _SPACE_INFO_CACHE.pop(stale_key, None)
+    cached = _SPACE_INFO_CACHE.get(key)
+    if cached:
+        return cached[1]
+    info = _get_api(token).space_info(repo_id=repo_id)
+    _SPACE_INFO_CACHE.pop(key, None)
+    _SPACE_INFO_CACHE[key] = (now, info)
+    # Evict the oldest entries (dicts keep insertion order)
+    while len(_SPACE_INFO_CACHE) > _SPACE_INFO_CACHE_MAX_ENTRIES:
+        _SPACE_INFO_CACHE.pop(next(iter(_SPACE_INFO_CACHE)), None)
+    return info
+
+
+def _resolve_token(token: Optional[str]) -> Optional[str]:
+    """Return the given token, falling back to the HF_TOKEN environment variable"""
+    return token or os.getenv("HF_TOKEN")
+
+
+def _requires_token(*missing_token_extras):
+    """
+    Decorator resolving the `token` argument (falling back to HF_TOKEN) before the call.
+    If no token is available, returns (False, "No HuggingFace token provided", *missing_token_extras)
+    instead of calling the wrapped function.
+    """
+    def decorator(func):
+        token_index = list(inspect.signature(func).parameters).index("token")
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if len(args) > token_index:
+                token = _resolve_token(args[token_index])
+                args = args[:token_index] + (token,) + args[token_index + 1:]
+            else:
+                token = _resolve_token(kwargs.get("token"))
+                kwargs["token"] = token
+            if not token:
+                return (False, "No HuggingFace token provided", *missing_token_extras)
+            return func(*args, **kwargs)
+        
+        return wrapper
+    return decorator
+
+
+def _clean_space_name(name: str) -> str:
+    """Clean a space name (no spaces, lowercase, alphanumeric + hyphens)"""
+    return _SPACE_NAME_DASH_RUNS.sub('-', name.lower().translate(_SPACE_NAME_CHARS)).strip('-')
+
+
+def _iter_files(root: str, prefix: str = ""):
+    """
+    Recursively yield (repo_path, local_path) for every regular file under root.
+    Uses os.scandir so file-type checks come from the directory listing instead of extra stat() calls.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            rel_path = f"{prefix}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path, f"{rel_path}/")
+            elif entry.is_file(follow_symlinks=False):
+                yield rel_path, entry.path
+
 
 def prettify_comfyui_json_for_html(json_content: str) -> str:
     """Convert ComfyUI JSON to stylized HTML display with download button"""
@@ -313,9 +465,6 @@ def add_anycoder_tag_to_readme(api, repo_id: str, app_port: Optional[int] = None
         sdk: Optional SDK type (e.g., 'gradio', 'streamlit', 'docker', 'static')
     """
     try:
-        import tempfile
-        import re
-        
         # Download the existing README
         readme_path = api.hf_hub_download(
             repo_id=repo_id,
@@ -442,7 +591,6 @@ def extract_space_id_from_history(history: Optional[List], username: Optional[st
     if not history:
         return None
     
-    import re
     existing_space = None
     
     # Look through history for previous deployments or imports
@@ -492,6 +640,7 @@ def extract_space_id_from_history(history: Optional[List], username: Optional[st
     return existing_space
 
 
+@_requires_token(None)
 def deploy_to_huggingface_space(
     code: str,
     language: str,
@@ -522,19 +671,17 @@ def deploy_to_huggingface_space(
     Returns:
         Tuple of (success: bool, message: str, space_url: Optional[str])
     """
-    if not token:
-        token = os.getenv("HF_TOKEN")
-        if not token:
-            return False, "No HuggingFace token provided", None
+    code_size = _code_size_bytes(code)
+    if code_size > _MAX_CODE_BYTES:
+        return False, f"Code payload too large ({code_size} bytes, limit {_MAX_CODE_BYTES})", None
     
     try:
-        api = HfApi(token=token)
+        api = _get_api(token)
         
         # Get username if not provided (needed for history tracking)
         if not username:
             try:
-                user_info = api.whoami()
-                username = user_info.get("name") or user_info.get("preferred_username") or "user"
+                username = _username_for(token)
             except Exception as e:
                 pass  # Will handle later if needed
         
@@ -562,7 +709,6 @@ def deploy_to_huggingface_space(
             
             # Import search/replace utilities
             from backend_search_replace import has_search_replace_blocks, parse_file_specific_changes, apply_search_replace_changes
-            from huggingface_hub import hf_hub_download
             
             # Check if code contains search/replace blocks
             if has_search_replace_blocks(code):
@@ -666,7 +812,6 @@ def deploy_to_huggingface_space(
                     
                 except Exception as e:
                     print(f"[Deploy] Error applying search/replace changes: {e}")
-                    import traceback
                     traceback.print_exc()
                     # Fall through to normal deployment
             else:
@@ -741,22 +886,20 @@ def deploy_to_huggingface_space(
         if is_update:
             # Use existing repo
             repo_id = existing_repo_id
-            space_name = existing_repo_id.split('/')[-1]
+            space_name = existing_repo_id.rpartition('/')[2]
             if '/' in existing_repo_id:
-                username = existing_repo_id.split('/')[0]
+                username = existing_repo_id.partition('/')[0]
             elif not username:
                 # Get username if still not available
                 try:
-                    user_info = api.whoami()
-                    username = user_info.get("name") or user_info.get("preferred_username") or "user"
+                    username = _username_for(token)
                 except Exception as e:
                     return False, f"Failed to get user info: {str(e)}", None
         else:
             # Get username if not provided
             if not username:
                 try:
-                    user_info = api.whoami()
-                    username = user_info.get("name") or user_info.get("preferred_username") or "user"
+                    username = _username_for(token)
                 except Exception as e:
                     return False, f"Failed to get user info: {str(e)}", None
             
@@ -766,8 +909,7 @@ def deploy_to_huggingface_space(
                 print(f"[Deploy] Auto-generated space name: {space_name}")
             
             # Clean space name (no spaces, lowercase, alphanumeric + hyphens)
-            space_name = re.sub(r'[^a-z0-9-]', '-', space_name.lower())
-            space_name = re.sub(r'-+', '-', space_name).strip('-')
+            space_name = _clean_space_name(space_name)
             
             # Ensure space_name is not empty after cleaning
             if not space_name:
@@ -787,6 +929,7 @@ def deploy_to_huggingface_space(
             # Parse code based on language
             app_port = None  # Track if we need app_port for Docker spaces
             use_individual_uploads = False  # Flag for transformers.js
+            requirements_future = None  # LLM requirements generation, overlapped with repo creation
             
             if language == "transformers.js":
                 try:
@@ -825,7 +968,7 @@ def deploy_to_huggingface_space(
                         print(f"[Deploy] Writing {filename} ({len(content)} chars) to {file_path}")
                         # Use text mode - Python handles encoding automatically
                         if filename == "requirements.txt":
-                            content = enforce_critical_versions(content)
+                            content = _enforce_critical_versions_cached(content)
                         file_path.write_text(content, encoding='utf-8')
                         # Verify the write was successful
                         written_size = file_path.stat().st_size
@@ -836,7 +979,6 @@ def deploy_to_huggingface_space(
                     
                 except Exception as e:
                     print(f"[Deploy] Error parsing transformers.js: {e}")
-                    import traceback
                     traceback.print_exc()
                     return False, f"Error parsing transformers.js output: {str(e)}", None
                 
@@ -866,7 +1008,7 @@ def deploy_to_huggingface_space(
                     file_path = temp_path / filename
                     file_path.parent.mkdir(parents=True, exist_ok=True)
                     if filename == "requirements.txt":
-                        content = enforce_critical_versions(content)
+                        content = _enforce_critical_versions_cached(content)
                     file_path.write_text(content, encoding='utf-8')
                 
                 # Ensure requirements.txt exists - generate from imports if missing
@@ -876,9 +1018,7 @@ def deploy_to_huggingface_space(
                     if main_app:
                         print(f"[Deploy] Generating requirements.txt from imports in {language} app")
                         import_statements = extract_import_statements(main_app)
-                        requirements_content = generate_requirements_txt_with_llm(import_statements)
-                        (temp_path / "requirements.txt").write_text(requirements_content, encoding='utf-8')
-                        print(f"[Deploy] Generated requirements.txt with {len(requirements_content.splitlines())} lines")
+                        requirements_future = _DEPLOY_EXECUTOR.submit(generate_requirements_txt_with_llm, import_statements)
                     else:
                         # Fallback to minimal requirements if no app file found
                         if language == "gradio":
@@ -933,7 +1073,7 @@ def deploy_to_huggingface_space(
                     file_path = temp_path / filename
                     file_path.parent.mkdir(parents=True, exist_ok=True)
                     if filename == "requirements.txt":
-                        content = enforce_critical_versions(content)
+                        content = _enforce_critical_versions_cached(content)
                     file_path.write_text(content, encoding='utf-8')
                 
                 # Generate requirements.txt from imports if missing
@@ -942,9 +1082,7 @@ def deploy_to_huggingface_space(
                     if main_app:
                         print(f"[Deploy] Generating requirements.txt from imports in default app")
                         import_statements = extract_import_statements(main_app)
-                        requirements_content = generate_requirements_txt_with_llm(import_statements)
-                        (temp_path / "requirements.txt").write_text(requirements_content, encoding='utf-8')
-                        print(f"[Deploy] Generated requirements.txt with {len(requirements_content.splitlines())} lines")
+                        requirements_future = _DEPLOY_EXECUTOR.submit(generate_requirements_txt_with_llm, import_statements)
                     else:
                         # Fallback to minimal requirements if no app file found
                         if language == "daggr":
@@ -969,71 +1107,42 @@ def deploy_to_huggingface_space(
                         exist_ok=True
                     )
                 except Exception as e:
+                    _cancel_pending(requirements_future)
                     return False, f"Failed to create space: {str(e)}", None
             elif is_update:
                 print(f"[Deploy] UPDATING existing space: {repo_id} (skipping create_repo)")
             
-            # Handle transformers.js spaces (create repo via duplicate_space)
+            # Handle transformers.js spaces (plain static repo - the three files are uploaded below,
+            # so forking the template space would only be overwritten)
             if language == "transformers.js":
                 if not is_update:
-                    print(f"[Deploy] Creating NEW transformers.js space via template duplication")
-                    print(f"[Deploy] space_name value: '{space_name}' (type: {type(space_name)})")
+                    print(f"[Deploy] Creating NEW transformers.js static space: {repo_id}")
                     
                     # Safety check for space_name
                     if not space_name:
+                        _cancel_pending(requirements_future)
                         return False, "Internal error: space_name is None after generation", None
                     
                     try:
-                        from huggingface_hub import duplicate_space
-                        
-                        # duplicate_space expects just the space name (not full repo_id)
-                        # Use strip() to clean the space name
-                        clean_space_name = space_name.strip()
-                        print(f"[Deploy] Attempting to duplicate template space to: {clean_space_name}")
-                        
-                        duplicated_repo = duplicate_space(
-                            from_id="static-templates/transformers.js",
-                            to_id=clean_space_name,
-                            token=token,
+                        api.create_repo(
+                            repo_id=repo_id,
+                            repo_type="space",
+                            space_sdk="static",
+                            private=private,
                             exist_ok=True
                         )
-                        print(f"[Deploy] Template duplication result: {duplicated_repo} (type: {type(duplicated_repo)})")
                     except Exception as e:
-                        print(f"[Deploy] Exception during duplicate_space: {type(e).__name__}: {str(e)}")
-                        
-                        # Check if space actually exists (success despite error)
-                        space_exists = False
-                        try:
-                            if api.space_info(repo_id):
-                                space_exists = True
-                        except:
-                            pass
-
-                        # Handle RepoUrl object "errors"
-                        error_msg = str(e)
-                        if ("'url'" in error_msg or "RepoUrl" in error_msg) and space_exists:
-                            print(f"[Deploy] Space exists despite RepoUrl error, continuing with deployment")
-                        else:
-                            # Fallback to regular create_repo
-                            print(f"[Deploy] Template duplication failed, attempting fallback to create_repo: {e}")
-                            try:
-                                api.create_repo(
-                                    repo_id=repo_id,
-                                    repo_type="space",
-                                    space_sdk="static",
-                                    private=private,
-                                    exist_ok=True
-                                )
-                                print(f"[Deploy] Fallback create_repo successful")
-                            except Exception as e2:
-                                return False, f"Failed to create transformers.js space (both duplication and fallback failed): {str(e2)}", None
+                        _cancel_pending(requirements_future)
+                        return False, f"Failed to create transformers.js space: {str(e)}", None
                 else:
                     # For updates, verify we can access the existing space
                     try:
                         space_info = api.space_info(repo_id)
                         if not space_info:
+                            _cancel_pending(requirements_future)
                             return False, f"Could not access space {repo_id} for update", None
                     except Exception as e:
+                        _cancel_pending(requirements_future)
                         return False, f"Cannot update space {repo_id}: {str(e)}", None
             
             # Handle Docker spaces (React/Streamlit) - create repo separately
@@ -1041,7 +1150,6 @@ def deploy_to_huggingface_space(
                 if not is_update:
                     print(f"[Deploy] Creating NEW Docker space for {language}: {repo_id}")
                     try:
-                        from huggingface_hub import create_repo as hf_create_repo
                         hf_create_repo(
                             repo_id=repo_id,
                             repo_type="space",
@@ -1050,8 +1158,15 @@ def deploy_to_huggingface_space(
                             exist_ok=True
                         )
                     except Exception as e:
+                        _cancel_pending(requirements_future)
                         return False, f"Failed to create Docker space: {str(e)}", None
             
+            # Collect the generated requirements.txt now that repo creation has run alongside it
+            if requirements_future is not None:
+                requirements_content = requirements_future.result()
+                (temp_path / "requirements.txt").write_text(requirements_content, encoding='utf-8')
+                print(f"[Deploy] Generated requirements.txt with {len(requirements_content.splitlines())} lines")
+            
             # Upload files
             if not commit_message:
                 commit_message = "Update from anycoder" if is_update else "Deploy from anycoder"
@@ -1060,17 +1175,15 @@ def deploy_to_huggingface_space(
                 if language == "transformers.js":
                     # Special handling for transformers.js - create NEW temp files for each upload
                     # This matches the working pattern in ui.py
-                    import time
                     
-                    # Get the parsed files from earlier
+                    # Get the parsed files from earlier (extension computed once, not per attempt)
                     files_to_upload = [
-                        ("index.html", files.get('index.html')),
-                        ("index.js", files.get('index.js')),
-                        ("style.css", files.get('style.css'))
+                        (file_name, files.get(file_name), os.path.splitext(file_name)[1])
+                        for file_name in ('index.html', 'index.js', 'style.css')
                     ]
                     
                     max_attempts = 3
-                    for file_name, file_content in files_to_upload:
+                    for file_name, file_content, file_ext in files_to_upload:
                         if not file_content:
                             return False, f"Missing content for {file_name}", None
                         
@@ -1083,7 +1196,7 @@ def deploy_to_huggingface_space(
                                 # Create a NEW temp file for this upload (matches Gradio version approach)
                                 print(f"[Deploy] Creating temp file for {file_name} with {len(file_content)} chars")
                                 # Use text mode "w" - lets Python handle encoding automatically (better emoji support)
-                                with tempfile.NamedTemporaryFile("w", suffix=f".{file_name.split('.')[-1]}", delete=False) as f:
+                                with tempfile.NamedTemporaryFile("w", suffix=file_ext, delete=False) as f:
                                     f.write(file_content)
                                     temp_file_path = f.name
                                 # File is now closed and flushed, safe to upload
@@ -1103,44 +1216,37 @@ def deploy_to_huggingface_space(
                                 last_error = e
                                 error_str = str(e)
                                 print(f"[Deploy] Upload error for {file_name}: {error_str}")
-                                if "403" in error_str or "Forbidden" in error_str:
+                                if _is_fatal_upload_error(error_str):
                                     return False, f"Permission denied uploading {file_name}. Check your token has write access to {repo_id}.", None
                                 
                                 if attempt < max_attempts - 1:
                                     time.sleep(2)  # Wait before retry
                                     print(f"[Deploy] Retry {attempt + 1}/{max_attempts} for {file_name}")
                             finally:
-                                # Clean up temp file
-                                if temp_file_path and os.path.exists(temp_file_path):
-                                    os.unlink(temp_file_path)
+                                # Clean up temp file (unlink directly - it exists on the happy path)
+                                if temp_file_path:
+                                    try:
+                                        os.unlink(temp_file_path)
+                                    except OSError:
+                                        pass
                         
                         if not success:
                             return False, f"Failed to upload {file_name} after {max_attempts} attempts: {last_error}", None
                 
                 elif use_individual_uploads:
                     # For React, Streamlit: upload each file individually
-                    import time
                     
-                    # Get list of files to upload from temp directory
-                    files_to_upload = []
-                    for file_path in temp_path.rglob('*'):
-                        if file_path.is_file():
-                            # Get relative path from temp directory (use forward slashes for repo paths)
-                            rel_path = file_path.relative_to(temp_path)
-                            files_to_upload.append(str(rel_path).replace('\\', '/'))
+                    # Get list of (repo path, local path) pairs to upload from temp directory
+                    # (the scan already proved each file exists, so no re-check below)
+                    files_to_upload = list(_iter_files(temp_dir))
                     
                     if not files_to_upload:
                         return False, "No files to upload", None
                     
-                    print(f"[Deploy] Uploading {len(files_to_upload)} files individually: {files_to_upload}")
+                    print(f"[Deploy] Uploading {len(files_to_upload)} files individually: {[name for name, _ in files_to_upload]}")
                     
                     max_attempts = 3
-                    for filename in files_to_upload:
-                        # Convert back to Path for filesystem operations
-                        file_path = temp_path / filename.replace('/', os.sep)
-                        if not file_path.exists():
-                            return False, f"Failed to upload: {filename} not found", None
-                        
+                    for filename, local_path in files_to_upload:
                         # Upload with retry logic
                         success = False
                         last_error = None
@@ -1149,7 +1255,7 @@ def deploy_to_huggingface_space(
                             try:
                                 # Upload without commit_message - HF API handles this for spaces
                                 api.upload_file(
-                                    path_or_fileobj=str(file_path),
+                                    path_or_fileobj=local_path,
                                     path_in_repo=filename,
                                     repo_id=repo_id,
                                     repo_type="space"
@@ -1161,7 +1267,7 @@ def deploy_to_huggingface_space(
                                 last_error = e
                                 error_str = str(e)
                                 print(f"[Deploy] Upload error for {filename}: {error_str}")
-                                if "403" in error_str or "Forbidden" in error_str:
+                                if _is_fatal_upload_error(error_str):
                                     return False, f"Permission denied uploading {filename}. Check your token has write access to {repo_id}.", None
                                 if attempt < max_attempts - 1:
                                     time.sleep(2)  # Wait before retry
@@ -1184,7 +1290,6 @@ def deploy_to_huggingface_space(
             # For new spaces: HF auto-generates README, wait and modify it
             # For updates: README should already exist, just add tag if missing
             try:
-                import time
                 if not is_update:
                     time.sleep(2)  # Give HF time to generate README for new spaces
                 add_anycoder_tag_to_readme(api, repo_id, app_port, sdk)
@@ -1212,11 +1317,11 @@ def deploy_to_huggingface_space(
             
     except Exception as e:
         print(f"[Deploy] Top-level exception caught: {type(e).__name__}: {str(e)}")
-        import traceback
         traceback.print_exc()
         return False, f"Deployment error: {str(e)}", None
 
 
+@_requires_token()
 def update_space_file(
     repo_id: str,
     file_path: str,
@@ -1237,13 +1342,8 @@ def update_space_file(
     Returns:
         Tuple of (success: bool, message: str)
     """
-    if not token:
-        token = os.getenv("HF_TOKEN")
-        if not token:
-            return False, "No HuggingFace token provided"
-    
     try:
-        api = HfApi(token=token)
+        api = _get_api(token)
         
         if not commit_message:
             commit_message = f"Update {file_path}"
@@ -1269,6 +1369,7 @@ def update_space_file(
         return False, f"Failed to update file: {str(e)}"
 
 
+@_requires_token()
 def delete_space(
     repo_id: str,
     token: Optional[str] = None
@@ -1283,22 +1384,63 @@ def delete_space(
     Returns:
         Tuple of (success: bool, message: str)
     """
-    if not token:
-        token = os.getenv("HF_TOKEN")
-        if not token:
-            return False, "No HuggingFace token provided"
-    
     try:
-        api = HfApi(token=token)
+        api = _get_api(token)
         api.delete_repo(repo_id=repo_id, repo_type="space")
         return True, f"✅ Successfully deleted {repo_id}"
     except Exception as e:
         return False, f"Failed to delete space: {str(e)}"
 
 
+def _space_to_dict(space) -> Dict:
+    """Convert a SpaceInfo entry from list_spaces into the dict shape returned to callers"""
+    space_id = space.id
+    return {
+        "id": space_id,
+        "author": space.author,
+        "name": getattr(space, 'name', space_id.rpartition('/')[2]),
+        "sdk": getattr(space, 'sdk', 'unknown'),
+        "private": getattr(space, 'private', False),
+        "url": f"https://huggingface.co/spaces/{space_id}"
+    }
+
+
+def iter_user_spaces(
+    username: Optional[str] = None,
+    token: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    Lazily yield a user's spaces as dicts while the API paginates, so callers can
+    start rendering before the last page arrives
+    
+    Args:
+        username: HuggingFace username (gets from token if None)
+        token: HuggingFace API token
+        limit: Maximum number of spaces to yield (all if None)
+    
+    Raises:
+        ValueError: If no token is provided or found in HF_TOKEN, or no username can be resolved
+    """
+    token = _resolve_token(token)
+    if not token:
+        raise ValueError("No HuggingFace token provided")
+    
+    api = _get_api(token)
+    
+    # Get username if not provided
+    if not username:
+        username = _username_for(token)
+    
+    for space in api.list_spaces(author=username, limit=limit):
+        yield _space_to_dict(space)
+
+
+@_requires_token(None)
 def list_user_spaces(
     username: Optional[str] = None,
-    token: Optional[str] = None
+    token: Optional[str] = None,
+    limit: Optional[int] = None
 ) -> Tuple[bool, str, Optional[List[Dict]]]:
     """
     List all spaces for a user
@@ -1306,43 +1448,20 @@ def list_user_spaces(
     Args:
         username: HuggingFace username (gets from token if None)
         token: HuggingFace API token
+        limit: Maximum number of spaces to return (all if None)
     
     Returns:
         Tuple of (success: bool, message: str, spaces: Optional[List[Dict]])
     """
-    if not token:
-        token = os.getenv("HF_TOKEN")
-        if not token:
-            return False, "No HuggingFace token provided", None
-    
     try:
-        api = HfApi(token=token)
-        
-        # Get username if not provided
-        if not username:
-            user_info = api.whoami()
-            username = user_info.get("name") or user_info.get("preferred_username")
-        
-        # List spaces
-        spaces = api.list_spaces(author=username)
-        
-        space_list = []
-        for space in spaces:
-            space_list.append({
-                "id": space.id,
-                "author": space.author,
-                "name": getattr(space, 'name', space.id.split('/')[-1]),
-                "sdk": getattr(space, 'sdk', 'unknown'),
-                "private": getattr(space, 'private', False),
-                "url": f"https://huggingface.co/spaces/{space.id}"
-            })
-        
+        space_list = list(iter_user_spaces(username=username, token=token, limit=limit))
         return True, f"Found {len(space_list)} spaces", space_list
         
     except Exception as e:
         return False, f"Failed to list spaces: {str(e)}", None
 
 
+@_requires_token(None)
 def duplicate_space_to_user(
     from_space_id: str,
     to_space_name: Optional[str] = None,
@@ -1361,26 +1480,17 @@ def duplicate_space_to_user(
     Returns:
         Tuple of (success: bool, message: str, space_url: Optional[str])
     """
-    if not token:
-        token = os.getenv("HF_TOKEN")
-        if not token:
-            return False, "No HuggingFace token provided", None
-    
     try:
-        from huggingface_hub import duplicate_space
-        
         # Get username from token
-        api = HfApi(token=token)
-        user_info = api.whoami()
-        username = user_info.get("name") or user_info.get("preferred_username") or "user"
+        username = _username_for(token)
         
         # Get original space info to detect hardware and SDK
-        print(f"[Duplicate] Fetching info for {from_space_id}")
+        logger.debug("[Duplicate] Fetching info for %s", from_space_id)
         original_hardware = None
         original_storage = None
         original_sdk = None
         try:
-            original_space_info = api.space_info(from_space_id)
+            original_space_info = _space_info_cached(from_space_id, token)
             # Get SDK type
             original_sdk = getattr(original_space_info, 'sdk', None)
             # Get runtime info
@@ -1388,24 +1498,23 @@ def duplicate_space_to_user(
             if runtime:
                 original_hardware = getattr(runtime, 'hardware', None)
                 original_storage = getattr(runtime, 'storage', None)
-            print(f"[Duplicate] Original space SDK: {original_sdk}, hardware: {original_hardware}, storage: {original_storage}")
+            logger.debug("[Duplicate] Original space SDK: %s, hardware: %s, storage: %s", original_sdk, original_hardware, original_storage)
         except Exception as e:
-            print(f"[Duplicate] Could not fetch space info: {e}")
+            logger.warning("[Duplicate] Could not fetch space info: %s", e)
         
         # If no destination name provided, use original name
         if not to_space_name:
             # Extract original space name
-            original_name = from_space_id.split('/')[-1]
+            original_name = from_space_id.rpartition('/')[2]
             to_space_name = original_name
         
         # Clean space name
-        to_space_name = re.sub(r'[^a-z0-9-]', '-', to_space_name.lower())
-        to_space_name = re.sub(r'-+', '-', to_space_name).strip('-')
+        to_space_name = _clean_space_name(to_space_name)
         
         # Construct full destination ID
         to_space_id = f"{username}/{to_space_name}"
         
-        print(f"[Duplicate] Duplicating {from_space_id} to {to_space_id}")
+        logger.debug("[Duplicate] Duplicating %s to %s", from_space_id, to_space_id)
         
         # Prepare duplicate_space parameters
         duplicate_params = {
@@ -1419,37 +1528,35 @@ def duplicate_space_to_user(
         # Use detected hardware or default to cpu-basic
         hardware_to_use = original_hardware if original_hardware else "cpu-basic"
         duplicate_params["hardware"] = hardware_to_use
-        print(f"[Duplicate] Hardware: {hardware_to_use} (SDK: {original_sdk}, original: {original_hardware})")
+        logger.debug("[Duplicate] Hardware: %s (SDK: %s, original: %s)", hardware_to_use, original_sdk, original_hardware)
         
         # Storage is optional
         if original_storage and original_storage.get('requested'):
             duplicate_params["storage"] = original_storage.get('requested')
-            print(f"[Duplicate] Storage: {original_storage.get('requested')}")
+            logger.debug("[Duplicate] Storage: %s", original_storage.get('requested'))
         
         # Only set private if explicitly requested
         if private:
             duplicate_params["private"] = private
         
         # Duplicate the space
-        print(f"[Duplicate] Duplicating {from_space_id} to {username}/{to_space_name}")
-        print(f"[Duplicate] Parameters: {list(duplicate_params.keys())}")
+        logger.debug("[Duplicate] Parameters: %s", list(duplicate_params))
         
         try:
             duplicated_repo = duplicate_space(**duplicate_params)
         except Exception as dup_error:
             # Check if it's a zero-gpu hardware error
-            error_str = str(dup_error).lower()
-            if 'zero' in error_str or 'hardware' in error_str:
-                print(f"[Duplicate] Hardware error detected (likely zero-gpu issue): {dup_error}")
-                print(f"[Duplicate] Retrying with cpu-basic hardware...")
+            if _HARDWARE_ERROR_RE.search(str(dup_error)):
+                logger.warning("[Duplicate] Hardware error detected (likely zero-gpu issue): %s", dup_error)
+                logger.debug("[Duplicate] Retrying with cpu-basic hardware...")
                 
                 # Retry with cpu-basic hardware
                 duplicate_params["hardware"] = "cpu-basic"
                 try:
                     duplicated_repo = duplicate_space(**duplicate_params)
-                    print(f"[Duplicate] ✅ Successfully duplicated with cpu-basic hardware")
+                    logger.debug("[Duplicate] ✅ Successfully duplicated with cpu-basic hardware")
                 except Exception as retry_error:
-                    print(f"[Duplicate] Retry with cpu-basic also failed: {retry_error}")
+                    logger.error("[Duplicate] Retry with cpu-basic also failed: %s", retry_error)
                     raise retry_error
             else:
                 # Not a hardware error, re-raise
@@ -1459,17 +1566,39 @@ def duplicate_space_to_user(
         space_url = f"https://huggingface.co/spaces/{to_space_id}"
         
         success_msg = f"✅ Space duplicated! View at: {space_url}"
-        print(f"[Duplicate] {success_msg}")
+        logger.debug("[Duplicate] %s", success_msg)
         
         return True, success_msg, space_url
         
     except Exception as e:
-        print(f"[Duplicate] Error: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Duplicate] Error: %s: %s", type(e).__name__, e)
         return False, f"Failed to duplicate space: {str(e)}", None
 
 
+def _parse_pr_python_files(code: str, main_filename: str = "app.py") -> Dict[str, str]:
+    """Parse multi-file output, falling back to the whole code as the main file"""
+    files = parse_multi_file_python_output(code)
+    if not files:
+        logger.debug("[PR] No file markers found, using entire code as %s", main_filename)
+        files[main_filename] = remove_code_block(code)
+    return files
+
+
+# Language -> parser producing {filename: content} for PR commits (default: _parse_pr_python_files)
+_PR_LANGUAGE_PARSERS = {
+    "transformers.js": parse_transformers_js_output,
+    "html": lambda code: {"index.html": parse_html_code(code)},
+    "comfyui": lambda code: {"index.html": prettify_comfyui_json_for_html(code)},
+    "gradio": _parse_pr_python_files,
+    "streamlit": functools.partial(_parse_pr_python_files, main_filename="streamlit_app.py"),
+    "react": functools.partial(_parse_pr_python_files, main_filename="app.tsx"),
+}
+
+# PR languages whose requirements.txt gets critical versions pinned
+_PR_PINNED_REQUIREMENTS_LANGUAGES = frozenset({"transformers.js", "gradio", "streamlit", "react"})
+
+
+@_requires_token(None)
 def create_pull_request_on_space(
     repo_id: str,
     code: str,
@@ -1492,25 +1621,15 @@ def create_pull_request_on_space(
     Returns:
         Tuple of (success: bool, message: str, pr_url: Optional[str])
     """
-    if not token:
-        token = os.getenv("HF_TOKEN")
-        if not token:
-            return False, "No HuggingFace token provided", None
+    code_size = _code_size_bytes(code)
+    if code_size > _MAX_CODE_BYTES:
+        return False, f"Code payload too large ({code_size} bytes, limit {_MAX_CODE_BYTES})", None
     
     try:
-        api = HfApi(token=token)
+        api = _get_api(token)
         
-        # Check if we can access the space first
-        try:
-            space_info = api.space_info(repo_id=repo_id, token=token)
-            print(f"[PR] Space info: private={space_info.private if hasattr(space_info, 'private') else 'unknown'}")
-            
-            # Check if space is private
-            if hasattr(space_info, 'private') and space_info.private:
-                return False, "❌ Cannot create PR on private space. The space must be public to accept PRs from others.", None
-        except Exception as info_error:
-            print(f"[PR] Could not fetch space info: {info_error}")
-            # Continue anyway - maybe we can still create the PR
+        # Start the space access probe in the background so its round-trip overlaps with parsing
+        space_info_future = _DEPLOY_EXECUTOR.submit(_space_info_cached, repo_id, token)
         
         # Default PR title and description
         if not pr_title:
@@ -1526,178 +1645,134 @@ def create_pull_request_on_space(
 
 Generated by [AnyCoder](https://huggingface.co/spaces/akhaliq/anycoder)"""
         
-        # Create temporary directory for files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        # Check if this is a redesign (pr_title contains "Redesign")
+        is_redesign = "redesign" in pr_title.lower() if pr_title else False
+        
+        if language == "gradio" and is_redesign and "===" not in code:
+            # Fast path: a redesign without any === file markers can only ever yield app.py,
+            # so skip the multi-file parse and .py filtering entirely
+            files = {'app.py': remove_code_block(code)}
+            logger.debug("[PR] Single-file redesign - will only update app.py (%d chars)", len(files['app.py']))
+        else:
+            # Parse code based on language (single dispatch-table lookup)
+            parser = _PR_LANGUAGE_PARSERS.get(language, _parse_pr_python_files)
+            try:
+                files = parser(code)
+                logger.debug("[PR] Parsed %s files: %s", language, list(files))
+            except Exception as e:
+                logger.warning("[PR] Error parsing %s: %s", language, e)
+                return False, f"Error parsing {language} output: {str(e)}", None
             
-            # Parse code based on language
-            if language == "transformers.js":
-                try:
-                    files = parse_transformers_js_output(code)
-                    print(f"[PR] Parsed transformers.js files: {list(files.keys())}")
-                    
-                    # Write transformers.js files
-                    for filename, content in files.items():
-                        file_path = temp_path / filename
-                        if filename == "requirements.txt":
-                            content = enforce_critical_versions(content)
-                        file_path.write_text(content, encoding='utf-8')
-                        
-                except Exception as e:
-                    print(f"[PR] Error parsing transformers.js: {e}")
-                    return False, f"Error parsing transformers.js output: {str(e)}", None
-                
-            elif language == "html":
-                html_code = parse_html_code(code)
-                (temp_path / "index.html").write_text(html_code, encoding='utf-8')
+            # For Gradio PRs, only include .py files (preserve existing requirements.txt, etc.)
+            # For redesigns, ONLY include app.py to avoid modifying helper files
+            if language == "gradio":
+                logger.debug("[PR] Gradio app - filtering to only .py files")
+                py_files = {fname: content for fname, content in files.items() if fname.endswith('.py')}
+                if not py_files:
+                    logger.warning("[PR] No .py files found in parsed output")
+                    return False, "No Python files found in generated code for Gradio PR", None
                 
-            elif language == "comfyui":
-                html_code = prettify_comfyui_json_for_html(code)
-                (temp_path / "index.html").write_text(html_code, encoding='utf-8')
-                
-            elif language in ["gradio", "streamlit", "react"]:
-                files = parse_multi_file_python_output(code)
-                
-                # Fallback if no files parsed
-                if not files:
-                    print(f"[PR] No file markers found, using entire code as main file")
-                    cleaned_code = remove_code_block(code)
-                    if language == "streamlit":
-                        files["streamlit_app.py"] = cleaned_code
-                    elif language == "react":
-                        files["app.tsx"] = cleaned_code
-                    else:
-                        files["app.py"] = cleaned_code
-                
-                # For Gradio PRs, only include .py files (preserve existing requirements.txt, etc.)
-                # For redesigns, ONLY include app.py to avoid modifying helper files
-                if language == "gradio":
-                    print(f"[PR] Gradio app - filtering to only .py files")
-                    py_files = {fname: content for fname, content in files.items() if fname.endswith('.py')}
-                    if not py_files:
-                        print(f"[PR] Warning: No .py files found in parsed output")
-                        return False, "No Python files found in generated code for Gradio PR", None
-                    
-                    # Check if this is a redesign (pr_title contains "Redesign")
-                    is_redesign = "redesign" in pr_title.lower() if pr_title else False
-                    
-                    if is_redesign:
-                        print(f"[PR] Redesign PR detected - filtering to ONLY app.py")
-                        if 'app.py' not in py_files:
-                            print(f"[PR] Warning: No app.py found in redesign output")
-                            return False, "No app.py found in redesign output for Gradio PR", None
-                        files = {'app.py': py_files['app.py']}
-                        print(f"[PR] Will only update app.py ({len(py_files['app.py'])} chars)")
-                    else:
-                        files = py_files
-                        print(f"[PR] Will update {len(files)} Python file(s): {list(files.keys())}")
-                
-                # Write files (create subdirectories if needed)
-                for filename, content in files.items():
-                    file_path = temp_path / filename
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
-                    if filename == "requirements.txt":
-                        content = enforce_critical_versions(content)
-                    file_path.write_text(content, encoding='utf-8')
-                
-                # Skip requirements.txt generation for Gradio PRs (preserve existing)
-                # For Streamlit, generate requirements.txt if missing
-                if language in ["streamlit", "daggr"] and "requirements.txt" not in files:
-                    main_app = files.get('streamlit_app.py') or files.get('app.py', '')
-                    if main_app:
-                        print(f"[PR] Generating requirements.txt from imports")
-                        import_statements = extract_import_statements(main_app)
-                        requirements_content = generate_requirements_txt_with_llm(import_statements)
-                        (temp_path / "requirements.txt").write_text(requirements_content, encoding='utf-8')
+                if is_redesign:
+                    logger.debug("[PR] Redesign PR detected - filtering to ONLY app.py")
+                    if 'app.py' not in py_files:
+                        logger.warning("[PR] No app.py found in redesign output")
+                        return False, "No app.py found in redesign output for Gradio PR", None
+                    files = {'app.py': py_files['app.py']}
+                    logger.debug("[PR] Will only update app.py (%d chars)", len(py_files['app.py']))
+                else:
+                    files = py_files
+                    logger.debug("[PR] Will update %d Python file(s): %s", len(files), list(files))
+        
+        # Check the space is accessible (before any LLM work for requirements.txt)
+        try:
+            space_info = space_info_future.result()
+            logger.debug("[PR] Space info: private=%s", getattr(space_info, 'private', 'unknown'))
             
-            else:
-                # Default: treat as code file
-                files = parse_multi_file_python_output(code)
-                if not files:
-                    cleaned_code = remove_code_block(code)
-                    files['app.py'] = cleaned_code
-                
-                for filename, content in files.items():
-                    file_path = temp_path / filename
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
-                    file_path.write_text(content, encoding='utf-8')
+            # Check if space is private
+            if hasattr(space_info, 'private') and space_info.private:
+                return False, "❌ Cannot create PR on private space. The space must be public to accept PRs from others.", None
+        except Exception as info_error:
+            logger.warning("[PR] Could not fetch space info: %s", info_error)
+            # Continue anyway - maybe we can still create the PR
+        
+        # Pin critical versions in a parsed requirements.txt (dedicated-parser languages only;
+        # daggr and other languages fall back to the plain file parse and commit files as-is)
+        if language in _PR_PINNED_REQUIREMENTS_LANGUAGES and "requirements.txt" in files:
+            files["requirements.txt"] = _enforce_critical_versions_cached(files["requirements.txt"])
+        
+        # Skip requirements.txt generation for Gradio PRs (preserve existing)
+        # For Streamlit, generate requirements.txt if missing
+        if language == "streamlit" and "requirements.txt" not in files:
+            main_app = files.get('streamlit_app.py') or files.get('app.py', '')
+            if main_app:
+                logger.debug("[PR] Generating requirements.txt from imports")
+                import_statements = extract_import_statements(main_app)
+                files["requirements.txt"] = generate_requirements_txt_with_llm(import_statements)
+        
+        # Encode every file once and upload straight from memory
+        operations = [
+            CommitOperationAdd(path_in_repo=filename, path_or_fileobj=content.encode('utf-8'))
+            for filename, content in files.items()
+        ]
+        
+        # Create PR with files using create_commit (recommended approach)
+        # This creates the PR and uploads files in one API call. It is not retried: if a
+        # request fails after the Hub opened the PR, a retry would open a duplicate.
+        try:
+            logger.debug("[PR] Creating pull request with files on %s", repo_id)
+            logger.debug("[PR] Prepared %d file operations", len(operations))
             
-            # Create PR with files using create_commit (recommended approach)
-            # This creates the PR and uploads files in one API call
-            try:
-                print(f"[PR] Creating pull request with files on {repo_id}")
-                
-                # Prepare operations for all files
-                from huggingface_hub import CommitOperationAdd
-                operations = []
-                
-                for file_path in temp_path.rglob('*'):
-                    if file_path.is_file():
-                        rel_path = file_path.relative_to(temp_path)
-                        operations.append(
-                            CommitOperationAdd(
-                                path_in_repo=str(rel_path),
-                                path_or_fileobj=str(file_path)
-                            )
-                        )
-                
-                print(f"[PR] Prepared {len(operations)} file operations")
-                print(f"[PR] Token being used (first 20 chars): {token[:20] if token else 'None'}...")
-                
-                # Create commit with PR (pass token explicitly)
-                commit_info = api.create_commit(
-                    repo_id=repo_id,
-                    repo_type="space",
-                    operations=operations,
-                    commit_message=pr_title,
-                    commit_description=pr_description,
-                    create_pr=True,  # This creates a PR with the changes
-                    token=token,  # Explicitly pass token
+            # Create commit with PR (pass token explicitly)
+            commit_info = api.create_commit(
+                repo_id=repo_id,
+                repo_type="space",
+                operations=operations,
+                commit_message=pr_title,
+                commit_description=pr_description,
+                create_pr=True,  # This creates a PR with the changes
+                token=token,  # Explicitly pass token
+                num_threads=max(1, min(8, len(operations))),  # Upload file contents in parallel
+            )
+            
+            # Extract PR URL
+            pr_url = commit_info.pr_url if hasattr(commit_info, 'pr_url') else None
+            pr_num = commit_info.pr_num if hasattr(commit_info, 'pr_num') else None
+            
+            if not pr_url and pr_num:
+                pr_url = f"https://huggingface.co/spaces/{repo_id}/discussions/{pr_num}"
+            elif not pr_url:
+                pr_url = f"https://huggingface.co/spaces/{repo_id}/discussions"
+            
+            logger.debug("[PR] Created PR: %s", pr_url)
+            success_msg = f"✅ Pull Request created! View at: {pr_url}"
+            
+            return True, success_msg, pr_url
+            
+        except Exception as e:
+            error_msg = str(e)
+            logger.exception("[PR] Error creating pull request: %s", error_msg)
+            
+            # Provide helpful error message based on the error type
+            if _is_fatal_upload_error(error_msg):
+                user_msg = (
+                    "❌ Cannot create Pull Request: Permission denied.\n\n"
+                    "**Possible reasons:**\n"
+                    "- The space owner hasn't enabled Pull Requests\n"
+                    "- You don't have write access to this space\n"
+                    "- Spaces have stricter PR permissions than models/datasets\n\n"
+                    "**What you can do:**\n"
+                    "✅ Use the 'Redesign' button WITHOUT checking 'Create PR' - this will:\n"
+                    "   1. Duplicate the space to your account\n"
+                    "   2. Apply the redesign to your copy\n"
+                    "   3. You'll own the new space!\n\n"
+                    "Or contact the space owner to enable Pull Requests."
                 )
-                
-                # Extract PR URL
-                pr_url = commit_info.pr_url if hasattr(commit_info, 'pr_url') else None
-                pr_num = commit_info.pr_num if hasattr(commit_info, 'pr_num') else None
-                
-                if not pr_url and pr_num:
-                    pr_url = f"https://huggingface.co/spaces/{repo_id}/discussions/{pr_num}"
-                elif not pr_url:
-                    pr_url = f"https://huggingface.co/spaces/{repo_id}/discussions"
-                
-                print(f"[PR] Created PR: {pr_url}")
-                success_msg = f"✅ Pull Request created! View at: {pr_url}"
-                
-                return True, success_msg, pr_url
-                
-            except Exception as e:
-                error_msg = str(e)
-                print(f"[PR] Error creating pull request: {error_msg}")
-                import traceback
-                traceback.print_exc()
-                
-                # Provide helpful error message based on the error type
-                if "403" in error_msg or "Forbidden" in error_msg or "Authorization" in error_msg:
-                    user_msg = (
-                        "❌ Cannot create Pull Request: Permission denied.\n\n"
-                        "**Possible reasons:**\n"
-                        "- The space owner hasn't enabled Pull Requests\n"
-                        "- You don't have write access to this space\n"
-                        "- Spaces have stricter PR permissions than models/datasets\n\n"
-                        "**What you can do:**\n"
-                        "✅ Use the 'Redesign' button WITHOUT checking 'Create PR' - this will:\n"
-                        "   1. Duplicate the space to your account\n"
-                        "   2. Apply the redesign to your copy\n"
-                        "   3. You'll own the new space!\n\n"
-                        "Or contact the space owner to enable Pull Requests."
-                    )
-                else:
-                    user_msg = f"Failed to create pull request: {error_msg}"
-                
-                return False, user_msg, None
+            else:
+                user_msg = f"Failed to create pull request: {error_msg}"
             
+            return False, user_msg, None
+        
     except Exception as e:
-        print(f"[PR] Top-level exception: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[PR] Top-level exception: %s: %s", type(e).__name__, e)
         return False, f"Pull request error: {str(e)}", None
 
@@ -3,220 +3,323 @@ Documentation management for backend system prompts.
 Handles fetching, caching, and updating documentation from llms.txt files.
 No dependencies on Gradio or other heavy libraries - pure Python only.
 """
+import hashlib
+import json
+import mmap
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
     print("Warning: requests library not available, using minimal fallback")
 
+# urllib3 decodes Brotli transparently when one of these is installed
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
 # Configuration
 GRADIO_LLMS_TXT_URL = "https://www.gradio.app/llms.txt"
 GRADIO_DOCS_CACHE_FILE = ".backend_gradio_docs_cache.txt"
 GRADIO_DOCS_LAST_UPDATE_FILE = ".backend_gradio_docs_last_update.txt"
+GRADIO_PROMPT_CACHE_FILE = ".backend_gradio_prompt_cache.v1.txt"
 
 TRANSFORMERSJS_DOCS_URL = "https://huggingface.co/docs/transformers.js/llms.txt"
 TRANSFORMERSJS_DOCS_CACHE_FILE = ".backend_transformersjs_docs_cache.txt"
 TRANSFORMERSJS_DOCS_LAST_UPDATE_FILE = ".backend_transformersjs_docs_last_update.txt"
+TRANSFORMERSJS_PROMPT_CACHE_FILE = ".backend_transformersjs_prompt_cache.v1.txt"
 
 COMFYUI_LLMS_TXT_URL = "https://docs.comfy.org/llms.txt"
 COMFYUI_DOCS_CACHE_FILE = ".backend_comfyui_docs_cache.txt"
 COMFYUI_DOCS_LAST_UPDATE_FILE = ".backend_comfyui_docs_last_update.txt"
-
-# Global variable to store the current Gradio documentation
-_gradio_docs_content: Optional[str] = None
-_gradio_docs_last_fetched: Optional[datetime] = None
-
-# Global variable to store the current transformers.js documentation
-_transformersjs_docs_content: Optional[str] = None
-_transformersjs_docs_last_fetched: Optional[datetime] = None
-
-# Global variable to store the current ComfyUI documentation
-_comfyui_docs_content: Optional[str] = None
-_comfyui_docs_last_fetched: Optional[datetime] = None
-
-def fetch_gradio_docs() -> Optional[str]:
-    """Fetch the latest Gradio documentation from llms.txt"""
+COMFYUI_PROMPT_CACHE_FILE = ".backend_comfyui_prompt_cache.v1.txt"
+
+# Shared HTTP session so all docs fetches reuse pooled keep-alive connections
+_session: Optional["requests.Session"] = None
+
+def _get_session() -> "requests.Session":
+    """Get (creating on first use) the shared docs HTTP session"""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=1))
+        # llms.txt files are large plain text and compress very well
+        session.headers["Accept-Encoding"] = "gzip, br" if HAS_BROTLI else "gzip"
+        _session = session
+    return _session
+
+# Returned by DocsSource.fetch when the server answers 304 Not Modified
+_NOT_MODIFIED = object()
+
+def _fetch_docs(url: str, name: str, headers: Optional[Dict[str, str]] = None) -> Optional["requests.Response"]:
+    """Fetch an llms.txt documentation file through the shared session (200 or 304 response)"""
     if not HAS_REQUESTS:
         return None
     
     try:
-        response = requests.get(GRADIO_LLMS_TXT_URL, timeout=10)
+        # Separate connect/read timeouts: fail fast on unreachable hosts, allow time for the body
+        response = _get_session().get(url, headers=headers, timeout=(3, 30))
         response.raise_for_status()
-        return response.text
+        return response
     except Exception as e:
-        print(f"Warning: Failed to fetch Gradio docs from {GRADIO_LLMS_TXT_URL}: {e}")
+        print(f"Warning: Failed to fetch {name} docs from {url}: {e}")
         return None
 
-def fetch_transformersjs_docs() -> Optional[str]:
-    """Fetch the latest transformers.js documentation from llms.txt"""
-    if not HAS_REQUESTS:
-        return None
-    
-    try:
-        response = requests.get(TRANSFORMERSJS_DOCS_URL, timeout=10)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        print(f"Warning: Failed to fetch transformers.js docs from {TRANSFORMERSJS_DOCS_URL}: {e}")
-        return None
-
-def fetch_comfyui_docs() -> Optional[str]:
-    """Fetch the latest ComfyUI documentation from llms.txt"""
-    if not HAS_REQUESTS:
-        return None
-    
-    try:
-        response = requests.get(COMFYUI_LLMS_TXT_URL, timeout=10)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        print(f"Warning: Failed to fetch ComfyUI docs from {COMFYUI_LLMS_TXT_URL}: {e}")
-        return None
+# Problematic phrases that cause early termination when LLM encounters ``` in user code
+# (compiled once - the docs filter runs over hundreds of KB per refresh)
+_LITERAL_PHRASES = [
+    "Output ONLY the code inside a ``` code block, and do not include any explanations or extra text",
+    "Do NOT add the language name at the top of the code output",
+    "do not include any explanations or extra text",
+]
+_PROBLEMATIC_PATTERNS = [
+    r"output only the code inside a ```.*?``` code block",
+    r"Always output only the.*?code.*?inside.*?```.*?```.*?block",
+    r"Return ONLY the code inside a.*?```.*?``` code block",
+    r"Always output only the.*?code blocks.*?shown above, and do not include any explanations",
+    r"Output.*?ONLY.*?code.*?inside.*?```.*?```",
+    r"Return.*?ONLY.*?code.*?inside.*?```.*?```",
+    r"Generate.*?ONLY.*?code.*?inside.*?```.*?```",
+    r"Provide.*?ONLY.*?code.*?inside.*?```.*?```",
+]
+# Everything fused into one alternation so the (large) docs string is scanned once, not once per pattern
+_FUSED_PROBLEMATIC_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in [*map(re.escape, _LITERAL_PHRASES), *_PROBLEMATIC_PATTERNS]),
+    re.IGNORECASE | re.DOTALL,
+)
+_PROBLEMATIC_MARKERS = ("only", "do not")
+_MULTI_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+# Only spaces/tabs: ^ already anchors at line start, so there's no need to scan across newlines
+_LEADING_WHITESPACE_RE = re.compile(r'^[ \t]+', re.MULTILINE)
 
 def filter_problematic_instructions(content: str) -> str:
     """Filter out problematic instructions that cause LLM to stop generation prematurely"""
     if not content:
         return content
     
-    # List of problematic phrases that cause early termination when LLM encounters ``` in user code
-    problematic_patterns = [
-        r"Output ONLY the code inside a ``` code block, and do not include any explanations or extra text",
-        r"output only the code inside a ```.*?``` code block",
-        r"Always output only the.*?code.*?inside.*?```.*?```.*?block",
-        r"Return ONLY the code inside a.*?```.*?``` code block",
-        r"Do NOT add the language name at the top of the code output",
-        r"do not include any explanations or extra text",
-        r"Always output only the.*?code blocks.*?shown above, and do not include any explanations",
-        r"Output.*?ONLY.*?code.*?inside.*?```.*?```",
-        r"Return.*?ONLY.*?code.*?inside.*?```.*?```",
-        r"Generate.*?ONLY.*?code.*?inside.*?```.*?```",
-        r"Provide.*?ONLY.*?code.*?inside.*?```.*?```",
-    ]
-    
-    # Remove problematic patterns
+    # Remove problematic patterns (case-insensitive). Every pattern contains "only" or
+    # "do not", so a cheap substring probe skips all the regex sweeps when neither appears
     filtered_content = content
-    for pattern in problematic_patterns:
-        # Use case-insensitive matching
-        filtered_content = re.sub(pattern, "", filtered_content, flags=re.IGNORECASE | re.DOTALL)
+    content_lower = content.lower()
+    if any(marker in content_lower for marker in _PROBLEMATIC_MARKERS):
+        filtered_content = _FUSED_PROBLEMATIC_RE.sub("", filtered_content)
     
     # Clean up any double newlines or extra whitespace left by removals
-    filtered_content = re.sub(r'\n\s*\n\s*\n', '\n\n', filtered_content)
-    filtered_content = re.sub(r'^\s+', '', filtered_content, flags=re.MULTILINE)
+    filtered_content = _MULTI_BLANK_LINES_RE.sub('\n\n', filtered_content)
+    filtered_content = _LEADING_WHITESPACE_RE.sub('', filtered_content)
     
     return filtered_content
 
-def load_cached_gradio_docs() -> Optional[str]:
-    """Load cached Gradio documentation from file"""
+def _load_cache(path: str, name: str) -> Optional[str]:
+    """Load a docs cache file through a read-only memory map"""
     try:
-        if os.path.exists(GRADIO_DOCS_CACHE_FILE):
-            with open(GRADIO_DOCS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                return f.read()
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            # mmap refuses zero-length files
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                # Decode straight from the mapped pages - slicing first would copy the whole file into bytes
+                return str(mm, 'utf-8')
+            finally:
+                mm.close()
     except Exception as e:
-        print(f"Warning: Failed to load cached Gradio docs: {e}")
+        print(f"Warning: Failed to load cached {name}: {e}")
     return None
 
-def save_gradio_docs_cache(content: str):
-    """Save Gradio documentation to cache file"""
-    try:
-        with open(GRADIO_DOCS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
-        with open(GRADIO_DOCS_LAST_UPDATE_FILE, 'w', encoding='utf-8') as f:
-            f.write(datetime.now().isoformat())
-    except Exception as e:
-        print(f"Warning: Failed to save Gradio docs cache: {e}")
-
-def should_update_gradio_docs() -> bool:
-    """Check if Gradio documentation should be updated"""
-    # Only update if we don't have cached content (first run or cache deleted)
-    return not os.path.exists(GRADIO_DOCS_CACHE_FILE)
-
-def load_cached_transformersjs_docs() -> Optional[str]:
-    """Load cached transformers.js documentation from file"""
+def _atomic_write(path: str, content: str):
+    """Write a file via a temp file + os.replace so readers never see a partial write"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def _atomic_write_pair(content_path: str, ts_path: str, content: str):
+    """Atomically write a cache file, then its timestamp sidecar"""
+    _atomic_write(content_path, content)
+    _atomic_write(ts_path, datetime.now().isoformat())
+
+def _prompt_cache_key(docs_cache_file: str, docs_content: str, template: str) -> Optional[str]:
+    """Key identifying the docs and template a persisted prompt was built from
+    (docs cache file mtime + length, template hash)"""
     try:
-        if os.path.exists(TRANSFORMERSJS_DOCS_CACHE_FILE):
-            with open(TRANSFORMERSJS_DOCS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                return f.read()
-    except Exception as e:
-        print(f"Warning: Failed to load cached transformers.js docs: {e}")
-    return None
-
-def save_transformersjs_docs_cache(content: str):
-    """Save transformers.js documentation to cache file"""
-    try:
-        with open(TRANSFORMERSJS_DOCS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
-        with open(TRANSFORMERSJS_DOCS_LAST_UPDATE_FILE, 'w', encoding='utf-8') as f:
-            f.write(datetime.now().isoformat())
-    except Exception as e:
-        print(f"Warning: Failed to save transformers.js docs cache: {e}")
-
-def should_update_transformersjs_docs() -> bool:
-    """Check if transformers.js documentation should be updated"""
-    # Only update if we don't have cached content (first run or cache deleted)
-    return not os.path.exists(TRANSFORMERSJS_DOCS_CACHE_FILE)
-
-def load_cached_comfyui_docs() -> Optional[str]:
-    """Load cached ComfyUI documentation from file"""
+        mtime_ns = os.stat(docs_cache_file).st_mtime_ns
+    except OSError:
+        return None
+    # Editing the base prompt or final instructions must invalidate the prompt even when the docs are unchanged
+    template_hash = hashlib.blake2b(template.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{mtime_ns} {len(docs_content)} {template_hash}"
+
+def _load_persisted_prompt(prompt_file: str, docs_cache_file: str, docs_content: str, template: str,
+                           name: str) -> Optional[str]:
+    """Load a previously assembled system prompt if it was built from the current docs cache and template"""
+    key = _prompt_cache_key(docs_cache_file, docs_content, template)
+    if key is None:
+        return None
     try:
-        if os.path.exists(COMFYUI_DOCS_CACHE_FILE):
-            with open(COMFYUI_DOCS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                return f.read()
-    except Exception as e:
-        print(f"Warning: Failed to load cached ComfyUI docs: {e}")
-    return None
-
-def save_comfyui_docs_cache(content: str):
-    """Save ComfyUI documentation to cache file"""
+        with open(prompt_file + ".meta", 'r', encoding='utf-8') as f:
+            if f.read() != key:
+                return None
+    except OSError:
+        return None
+    return _load_cache(prompt_file, f"{name} system prompt") or None
+
+def _persist_prompt(prompt_file: str, docs_cache_file: str, docs_content: str, template: str, prompt: str,
+                    name: str):
+    """Save an assembled system prompt next to the docs cache it was built from"""
+    key = _prompt_cache_key(docs_cache_file, docs_content, template)
+    if key is None:
+        return
     try:
-        with open(COMFYUI_DOCS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
-        with open(COMFYUI_DOCS_LAST_UPDATE_FILE, 'w', encoding='utf-8') as f:
-            f.write(datetime.now().isoformat())
+        _atomic_write(prompt_file, prompt)
+        _atomic_write(prompt_file + ".meta", key)
     except Exception as e:
-        print(f"Warning: Failed to save ComfyUI docs cache: {e}")
+        print(f"Warning: Failed to save {name} system prompt cache: {e}")
 
-def should_update_comfyui_docs() -> bool:
-    """Check if ComfyUI documentation should be updated"""
-    # Only update if we don't have cached content (first run or cache deleted)
-    return not os.path.exists(COMFYUI_DOCS_CACHE_FILE)
-
-def get_gradio_docs_content() -> str:
-    """Get the current Gradio documentation content, updating if necessary"""
-    global _gradio_docs_content, _gradio_docs_last_fetched
+class DocsSource:
+    """An llms.txt documentation source with its on-disk cache and assembled-prompt cache"""
+    
+    __slots__ = ('name', 'title', 'url', 'cache_file', 'ts_file', 'prompt_cache_file', 'fallback',
+                 '_content', '_loaded', '_prompt_cache', '_validators')
     
-    # Check if we need to update
-    if (_gradio_docs_content is None or 
-        _gradio_docs_last_fetched is None or 
-        should_update_gradio_docs()):
+    def __init__(self, name: str, title: str, url: str, cache_file: str, ts_file: str,
+                 prompt_cache_file: str, fallback: str):
+        self.name = name
+        self.title = title
+        self.url = url
+        self.cache_file = cache_file
+        self.ts_file = ts_file
+        self.prompt_cache_file = prompt_cache_file
+        self.fallback = fallback
+        self._content: Optional[str] = None
+        # True once real docs (fetched or cached) are loaded; the offline fallback keeps retrying
+        self._loaded = False
+        # Assembled system prompt, stored as (docs_content, prompt) and reused while the docs string is unchanged
+        self._prompt_cache: Optional[Tuple[str, str]] = None
+        # Conditional-request headers (If-None-Match / If-Modified-Since) from the last full download
+        self._validators: Dict[str, str] = {}
+    
+    @property
+    def headers_file(self) -> str:
+        return self.cache_file + ".headers.json"
+    
+    def _load_validators(self) -> Dict[str, str]:
+        """Load the validators saved with the cache (only meaningful while the cache exists)"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.headers_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return {}
+    
+    def fetch(self):
+        """Fetch the latest documentation from llms.txt (None on failure, _NOT_MODIFIED if the cache is current)"""
+        response = _fetch_docs(self.url, self.name, self._load_validators())
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return _NOT_MODIFIED
+        
+        self._validators = {
+            header: value
+            for header, value in (("If-None-Match", response.headers.get("ETag")),
+                                  ("If-Modified-Since", response.headers.get("Last-Modified")))
+            if value
+        }
+        return response.text
+    
+    def load(self) -> Optional[str]:
+        """Load cached documentation from file"""
+        return _load_cache(self.cache_file, f"{self.name} docs")
+    
+    def save(self, content: str):
+        """Save documentation to cache file"""
+        try:
+            _atomic_write_pair(self.cache_file, self.ts_file, content)
+            # Validators are written after the content so they never describe a cache that wasn't saved
+            _atomic_write(self.headers_file, json.dumps(self._validators))
+        except Exception as e:
+            print(f"Warning: Failed to save {self.name} docs cache: {e}")
+    
+    def get_content(self) -> str:
+        """Get the current documentation content, updating if necessary"""
+        # Check if we need to update - purely in-memory, so warm calls don't stat the cache file
+        if self._content is None or not self._loaded:
+            
+            print(f"📚 Loading {self.title} documentation...")
+            
+            # Try to fetch latest content
+            latest_content = self.fetch()
+            not_modified = latest_content is _NOT_MODIFIED
+            
+            if latest_content and not not_modified:
+                # Filter out problematic instructions that cause early termination
+                filtered_content = filter_problematic_instructions(latest_content)
+                self._content = filtered_content
+                self._loaded = True
+                self.save(filtered_content)
+                print(f"✅ {self.title} documentation loaded successfully ({len(filtered_content)} chars)")
+            else:
+                # Fallback to cached content
+                cached_content = self.load()
+                if cached_content:
+                    self._content = cached_content
+                    self._loaded = True
+                    if not_modified:
+                        # Server confirmed the cache is current, so the download and filter are skipped
+                        print(f"✅ {self.title} documentation unchanged, using cache ({len(cached_content)} chars)")
+                    else:
+                        print(f"⚠️ Using cached {self.name} documentation (network fetch failed) ({len(cached_content)} chars)")
+                else:
+                    # Fallback to minimal content
+                    self._content = self.fallback
+                    print(f"❌ Using minimal fallback {self.name} documentation")
         
-        print("📚 Loading Gradio 6 documentation...")
+        return self._content or ""
+    
+    def build_prompt(self, template: str) -> str:
+        """Wrap the current documentation in a system prompt, reusing a cached assembly when possible"""
+        docs_content = self.get_content()
         
-        # Try to fetch latest content
-        latest_content = fetch_gradio_docs()
+        # Docs are only ever replaced (never mutated), so identity tells us the cached prompt is current
+        if self._prompt_cache is not None and self._prompt_cache[0] is docs_content:
+            return self._prompt_cache[1]
         
-        if latest_content:
-            # Filter out problematic instructions that cause early termination
-            filtered_content = filter_problematic_instructions(latest_content)
-            _gradio_docs_content = filtered_content
-            _gradio_docs_last_fetched = datetime.now()
-            save_gradio_docs_cache(filtered_content)
-            print(f"✅ Gradio 6 documentation loaded successfully ({len(filtered_content)} chars)")
-        else:
-            # Fallback to cached content
-            cached_content = load_cached_gradio_docs()
-            if cached_content:
-                _gradio_docs_content = cached_content
-                _gradio_docs_last_fetched = datetime.now()
-                print(f"⚠️ Using cached Gradio documentation (network fetch failed) ({len(cached_content)} chars)")
-            else:
-                # Fallback to minimal content
-                _gradio_docs_content = """
+        # Reuse the prompt assembled by a previous process if the docs cache and template haven't changed since
+        prompt = _load_persisted_prompt(self.prompt_cache_file, self.cache_file, docs_content, template, self.name)
+        if prompt is None:
+            # Single formatting pass over a template prepared at import (see _prompt_template)
+            prompt = template.format_map({"docs": docs_content})
+            _persist_prompt(self.prompt_cache_file, self.cache_file, docs_content, template, prompt, self.name)
+        
+        self._prompt_cache = (docs_content, prompt)
+        return prompt
+
+def _prompt_template(base_prompt: str, final_instructions: str) -> str:
+    """Combine prompt parts into a format_map template with a single {docs} slot"""
+    # The prompts contain code examples with literal braces, which must be escaped
+    def escape(text: str) -> str:
+        return text.replace("{", "{{").replace("}", "}}")
+    return escape(base_prompt) + "{docs}" + escape(final_instructions)
+
+# Minimal content used when neither the network nor the cache has documentation
+_GRADIO_FALLBACK_DOCS = """
 # Gradio API Reference (Offline Fallback)
 
 This is a minimal fallback when documentation cannot be fetched.
@@ -227,41 +330,8 @@ Use gr.Blocks() for custom layouts and gr.Interface() for simple apps.
 
 For the latest documentation, visit: https://www.gradio.app/llms.txt
 """
-                print("❌ Using minimal fallback documentation")
-    
-    return _gradio_docs_content or ""
 
-def get_transformersjs_docs_content() -> str:
-    """Get the current transformers.js documentation content, updating if necessary"""
-    global _transformersjs_docs_content, _transformersjs_docs_last_fetched
-    
-    # Check if we need to update
-    if (_transformersjs_docs_content is None or 
-        _transformersjs_docs_last_fetched is None or 
-        should_update_transformersjs_docs()):
-        
-        print("📚 Loading transformers.js documentation...")
-        
-        # Try to fetch latest content
-        latest_content = fetch_transformersjs_docs()
-        
-        if latest_content:
-            # Filter out problematic instructions that cause early termination
-            filtered_content = filter_problematic_instructions(latest_content)
-            _transformersjs_docs_content = filtered_content
-            _transformersjs_docs_last_fetched = datetime.now()
-            save_transformersjs_docs_cache(filtered_content)
-            print(f"✅ transformers.js documentation loaded successfully ({len(filtered_content)} chars)")
-        else:
-            # Fallback to cached content
-            cached_content = load_cached_transformersjs_docs()
-            if cached_content:
-                _transformersjs_docs_content = cached_content
-                _transformersjs_docs_last_fetched = datetime.now()
-                print(f"⚠️ Using cached transformers.js documentation (network fetch failed) ({len(cached_content)} chars)")
-            else:
-                # Fallback to minimal content
-                _transformersjs_docs_content = """
+_TRANSFORMERSJS_FALLBACK_DOCS = """
 # Transformers.js API Reference (Offline Fallback)
 
 This is a minimal fallback when documentation cannot be fetched.
@@ -284,41 +354,8 @@ const out = await pipe('I love transformers!');
 
 For the latest documentation, visit: https://huggingface.co/docs/transformers.js
 """
-                print("❌ Using minimal fallback transformers.js documentation")
-    
-    return _transformersjs_docs_content or ""
 
-def get_comfyui_docs_content() -> str:
-    """Get the current ComfyUI documentation content, updating if necessary"""
-    global _comfyui_docs_content, _comfyui_docs_last_fetched
-    
-    # Check if we need to update
-    if (_comfyui_docs_content is None or 
-        _comfyui_docs_last_fetched is None or 
-        should_update_comfyui_docs()):
-        
-        print("📚 Loading ComfyUI documentation...")
-        
-        # Try to fetch latest content
-        latest_content = fetch_comfyui_docs()
-        
-        if latest_content:
-            # Filter out problematic instructions that cause early termination
-            filtered_content = filter_problematic_instructions(latest_content)
-            _comfyui_docs_content = filtered_content
-            _comfyui_docs_last_fetched = datetime.now()
-            save_comfyui_docs_cache(filtered_content)
-            print(f"✅ ComfyUI documentation loaded successfully ({len(filtered_content)} chars)")
-        else:
-            # Fallback to cached content
-            cached_content = load_cached_comfyui_docs()
-            if cached_content:
-                _comfyui_docs_content = cached_content
-                _comfyui_docs_last_fetched = datetime.now()
-                print(f"⚠️ Using cached ComfyUI documentation (network fetch failed) ({len(cached_content)} chars)")
-            else:
-                # Fallback to minimal content
-                _comfyui_docs_content = """
+_COMFYUI_FALLBACK_DOCS = """
 # ComfyUI API Reference (Offline Fallback)
 
 This is a minimal fallback when documentation cannot be fetched.
@@ -329,18 +366,28 @@ Use CheckpointLoaderSimple, CLIPTextEncode, KSampler for basic workflows.
 
 For the latest documentation, visit: https://docs.comfy.org/llms.txt
 """
-                print("❌ Using minimal fallback ComfyUI documentation")
-    
-    return _comfyui_docs_content or ""
 
-def build_gradio_system_prompt() -> str:
-    """Build the complete Gradio system prompt with full documentation"""
-    
-    # Get the full Gradio 6 documentation
-    docs_content = get_gradio_docs_content()
-    
-    # Base system prompt with anycoder-specific instructions
-    base_prompt = """🚨 CRITICAL: You are an expert Gradio 6 developer. You MUST use Gradio 6 syntax and API.
+GRADIO_DOCS = DocsSource("Gradio", "Gradio 6", GRADIO_LLMS_TXT_URL, GRADIO_DOCS_CACHE_FILE,
+                         GRADIO_DOCS_LAST_UPDATE_FILE, GRADIO_PROMPT_CACHE_FILE, _GRADIO_FALLBACK_DOCS)
+TRANSFORMERSJS_DOCS = DocsSource("transformers.js", "transformers.js", TRANSFORMERSJS_DOCS_URL, TRANSFORMERSJS_DOCS_CACHE_FILE,
+                                 TRANSFORMERSJS_DOCS_LAST_UPDATE_FILE, TRANSFORMERSJS_PROMPT_CACHE_FILE, _TRANSFORMERSJS_FALLBACK_DOCS)
+COMFYUI_DOCS = DocsSource("ComfyUI", "ComfyUI", COMFYUI_LLMS_TXT_URL, COMFYUI_DOCS_CACHE_FILE,
+                          COMFYUI_DOCS_LAST_UPDATE_FILE, COMFYUI_PROMPT_CACHE_FILE, _COMFYUI_FALLBACK_DOCS)
+
+def get_gradio_docs_content() -> str:
+    """Get the current Gradio documentation content, updating if necessary"""
+    return GRADIO_DOCS.get_content()
+
+def get_transformersjs_docs_content() -> str:
+    """Get the current transformers.js documentation content, updating if necessary"""
+    return TRANSFORMERSJS_DOCS.get_content()
+
+def get_comfyui_docs_content() -> str:
+    """Get the current ComfyUI documentation content, updating if necessary"""
+    return COMFYUI_DOCS.get_content()
+
+# Base system prompt with anycoder-specific instructions
+_GRADIO_BASE_PROMPT = """🚨 CRITICAL: You are an expert Gradio 6 developer. You MUST use Gradio 6 syntax and API.
 
 ## Key Gradio 6 Changes (MUST FOLLOW):
 - 🚨 **BREAKING CHANGE**: `theme`, `css`, `js`, `head` parameters moved from `gr.Blocks()` to `demo.launch()`
@@ -482,12 +529,9 @@ IMPORTANT: Always include "Built with anycoder" as clickable text in the header/
 Below is the complete, official Gradio 6 documentation automatically synced from https://www.gradio.app/llms.txt:
 
 """
-    
-    # Combine base prompt with full documentation
-    full_prompt = base_prompt + docs_content
-    
-    # Add final instructions
-    final_instructions = """
+
+# Final instructions appended after the full documentation
+_GRADIO_FINAL_INSTRUCTIONS = """
 
 ---
 
@@ -519,17 +563,15 @@ YOU MUST USE GRADIO 6 SYNTAX. This is MANDATORY:
 REMINDER: You are writing Gradio 6 code with modern themes. In Gradio 6, `gr.Blocks()` has NO parameters - everything goes in `demo.launch()`. Double-check all syntax against the Gradio 6 documentation provided above.
 
 """
-    
-    return full_prompt + final_instructions
 
-def build_transformersjs_system_prompt() -> str:
-    """Build the complete transformers.js system prompt with full documentation"""
-    
-    # Get the full transformers.js documentation
-    docs_content = get_transformersjs_docs_content()
-    
-    # Base system prompt with anycoder-specific instructions
-    base_prompt = """You are an expert transformers.js developer. Create a complete, working browser-based ML application using transformers.js based on the user's request. Generate all necessary code to make the application functional and runnable in the browser.
+_GRADIO_PROMPT_TEMPLATE = _prompt_template(_GRADIO_BASE_PROMPT, _GRADIO_FINAL_INSTRUCTIONS)
+
+def build_gradio_system_prompt() -> str:
+    """Build the complete Gradio system prompt with full documentation"""
+    return GRADIO_DOCS.build_prompt(_GRADIO_PROMPT_TEMPLATE)
+
+# Base system prompt with anycoder-specific instructions
+_TRANSFORMERSJS_BASE_PROMPT = """You are an expert transformers.js developer. Create a complete, working browser-based ML application using transformers.js based on the user's request. Generate all necessary code to make the application functional and runnable in the browser.
 
 ## Multi-File Application Structure
 
@@ -581,12 +623,9 @@ IMPORTANT: Always include "Built with anycoder" as clickable text in the header/
 Below is the complete, official transformers.js documentation automatically synced from https://huggingface.co/docs/transformers.js/llms.txt:
 
 """
-    
-    # Combine base prompt with full documentation
-    full_prompt = base_prompt + docs_content
-    
-    # Add final instructions
-    final_instructions = """
+
+# Final instructions appended after the full documentation
+_TRANSFORMERSJS_FINAL_INSTRUCTIONS = """
 
 ---
 
@@ -601,17 +640,15 @@ Below is the complete, official transformers.js documentation automatically sync
 - Consider using Web Workers for heavy computation to keep UI responsive
 
 """
-    
-    return full_prompt + final_instructions
 
-def build_comfyui_system_prompt() -> str:
-    """Build the complete ComfyUI system prompt with full documentation"""
-    
-    # Get the full ComfyUI documentation
-    docs_content = get_comfyui_docs_content()
-    
-    # Base system prompt with anycoder-specific instructions
-    base_prompt = """You are an expert ComfyUI developer. Generate clean, valid JSON workflows for ComfyUI based on the user's request.
+_TRANSFORMERSJS_PROMPT_TEMPLATE = _prompt_template(_TRANSFORMERSJS_BASE_PROMPT, _TRANSFORMERSJS_FINAL_INSTRUCTIONS)
+
+def build_transformersjs_system_prompt() -> str:
+    """Build the complete transformers.js system prompt with full documentation"""
+    return TRANSFORMERSJS_DOCS.build_prompt(_TRANSFORMERSJS_PROMPT_TEMPLATE)
+
+# Base system prompt with anycoder-specific instructions
+_COMFYUI_BASE_PROMPT = """You are an expert ComfyUI developer. Generate clean, valid JSON workflows for ComfyUI based on the user's request.
 
 🚨 CRITICAL: READ THE USER'S REQUEST CAREFULLY AND GENERATE A WORKFLOW THAT MATCHES THEIR SPECIFIC NEEDS.
 
@@ -646,12 +683,9 @@ ComfyUI workflows are JSON structures that define:
 Below is the complete, official ComfyUI documentation automatically synced from https://docs.comfy.org/llms.txt:
 
 """
-    
-    # Combine base prompt with full documentation
-    full_prompt = base_prompt + docs_content
-    
-    # Add final instructions
-    final_instructions = """
+
+# Final instructions appended after the full documentation
+_COMFYUI_FINAL_INSTRUCTIONS = """
 
 ---
 
@@ -668,39 +702,38 @@ Below is the complete, official ComfyUI documentation automatically synced from
 🚨 REMINDER: Your workflow should directly address what the user asked for. Don't ignore their message!
 
 """
-    
-    return full_prompt + final_instructions
+
+_COMFYUI_PROMPT_TEMPLATE = _prompt_template(_COMFYUI_BASE_PROMPT, _COMFYUI_FINAL_INSTRUCTIONS)
+
+def build_comfyui_system_prompt() -> str:
+    """Build the complete ComfyUI system prompt with full documentation"""
+    return COMFYUI_DOCS.build_prompt(_COMFYUI_PROMPT_TEMPLATE)
 
 def initialize_backend_docs():
     """Initialize backend documentation system on startup"""
     try:
-        # Pre-load the Gradio documentation
-        gradio_docs = get_gradio_docs_content()
-        if gradio_docs:
-            print(f"🚀 Gradio documentation initialized ({len(gradio_docs)} chars loaded)")
-        else:
-            print("⚠️ Gradio documentation initialized with fallback content")
+        # Pre-load all documentation sources concurrently so cold start costs the slowest fetch, not the sum
+        sources = [
+            ("Gradio", GRADIO_DOCS.get_content),
+            ("transformers.js", TRANSFORMERSJS_DOCS.get_content),
+            ("ComfyUI", COMFYUI_DOCS.get_content),
+        ]
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = [(name, executor.submit(loader)) for name, loader in sources]
         
-        # Pre-load the transformers.js documentation
-        transformersjs_docs = get_transformersjs_docs_content()
-        if transformersjs_docs:
-            print(f"🚀 transformers.js documentation initialized ({len(transformersjs_docs)} chars loaded)")
-        else:
-            print("⚠️ transformers.js documentation initialized with fallback content")
-        
-        # Pre-load the ComfyUI documentation
-        comfyui_docs = get_comfyui_docs_content()
-        if comfyui_docs:
-            print(f"🚀 ComfyUI documentation initialized ({len(comfyui_docs)} chars loaded)")
-        else:
-            print("⚠️ ComfyUI documentation initialized with fallback content")
+        for name, future in futures:
+            docs = future.result()
+            if docs:
+                print(f"🚀 {name} documentation initialized ({len(docs)} chars loaded)")
+            else:
+                print(f"⚠️ {name} documentation initialized with fallback content")
             
     except Exception as e:
         print(f"Warning: Failed to initialize backend documentation: {e}")
 
-# Initialize on import
-if __name__ != "__main__":
-    # Only initialize if being imported (not run directly)
+# Initialize on import only when opted in - the API server calls initialize_backend_docs() itself,
+# and other importers (scripts, tests) shouldn't block on network fetches
+if __name__ != "__main__" and os.environ.get("BACKEND_DOCS_PRELOAD") == "1":
     try:
         initialize_backend_docs()
     except Exception as e:
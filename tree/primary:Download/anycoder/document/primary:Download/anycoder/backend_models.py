@@ -2,110 +2,86 @@
 Standalone model inference and client management for AnyCoder Backend API.
 No Gradio dependencies - works with FastAPI/backend only.
 """
+import functools
 import os
 from typing import Optional
 
 from openai import OpenAI
 
+# Models served through the HuggingFace Router (the provider is selected by the
+# suffix from get_real_model_id): MiniMax M2, Kimi K2, DeepSeek and GLM families
+_HF_ROUTER_MODELS = frozenset({
+    "MiniMaxAI/MiniMax-M2",
+    "MiniMaxAI/MiniMax-M2.1",
+    "moonshotai/Kimi-K2-Thinking",
+    "moonshotai/Kimi-K2-Instruct",
+})
+_HF_ROUTER_PREFIXES = ("deepseek-ai/", "zai-org/GLM-4", "moonshotai/Kimi-K2")
+
+# Model ID -> model ID with the provider suffix required for API calls
+_EXACT_MODEL_MAP = {
+    "zai-org/GLM-4.6": "zai-org/GLM-4.6:cerebras",
+    "MiniMaxAI/MiniMax-M2": "MiniMaxAI/MiniMax-M2:novita",
+    "MiniMaxAI/MiniMax-M2.1": "MiniMaxAI/MiniMax-M2.1:novita",
+    "moonshotai/Kimi-K2-Thinking": "moonshotai/Kimi-K2-Thinking:together",
+    "moonshotai/Kimi-K2-Instruct": "moonshotai/Kimi-K2-Instruct:groq",
+    "zai-org/GLM-4.5": "zai-org/GLM-4.5:fireworks-ai",
+    "zai-org/GLM-4.7": "zai-org/GLM-4.7:cerebras",
+    "zai-org/GLM-4.7-Flash": "zai-org/GLM-4.7-Flash:novita",
+    "moonshotai/Kimi-K2.5": "moonshotai/Kimi-K2.5:novita",
+}
+
+# (prefix, suffix) rules for model families whose variants all use the same provider
+_PREFIX_SUFFIX_RULES = (
+    ("deepseek-ai/DeepSeek-V3", ":novita"),
+    ("deepseek-ai/DeepSeek-R1", ":novita"),
+)
+
+@functools.lru_cache(maxsize=8)
+def _hf_router_client(api_key: Optional[str]) -> OpenAI:
+    """Shared HuggingFace Router client (one connection pool per token)"""
+    return OpenAI(
+        base_url="https://router.huggingface.co/v1",
+        api_key=api_key,
+        default_headers={"X-HF-Bill-To": "huggingface"}
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _hf_inference_client(api_key: Optional[str]) -> OpenAI:
+    """Shared HuggingFace Inference API client (one connection pool per token)"""
+    return OpenAI(
+        base_url="https://api-inference.huggingface.co/v1",
+        api_key=api_key
+    )
+
+
 def get_inference_client(model_id: str, provider: str = "auto"):
     """
     Return an appropriate client based on model_id.
     
     Returns OpenAI-compatible client for all models or raises error if not configured.
+    Clients are cached and shared, so repeated calls reuse the same HTTP connection pool.
     """
-    if model_id == "MiniMaxAI/MiniMax-M2" or model_id == "MiniMaxAI/MiniMax-M2.1":
-        # Use HuggingFace Router with Novita provider for MiniMax M2 models
-        return OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-            default_headers={"X-HF-Bill-To": "huggingface"}
-        )
-    
-    elif model_id == "moonshotai/Kimi-K2-Thinking":
-        # Use HuggingFace Router with Novita provider
-        return OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-            default_headers={"X-HF-Bill-To": "huggingface"}
-        )
-    
-    elif model_id == "moonshotai/Kimi-K2-Instruct":
-        # Use HuggingFace Router with Groq provider
-        return OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-            default_headers={"X-HF-Bill-To": "huggingface"}
-        )
+    # Token is read per call so a rotated HF_TOKEN gets a fresh client
+    api_key = os.getenv("HF_TOKEN")
     
-    elif model_id.startswith("deepseek-ai/"):
-        # DeepSeek models via HuggingFace Router with Novita provider
-        return OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-            default_headers={"X-HF-Bill-To": "huggingface"}
-        )
+    if model_id in _HF_ROUTER_MODELS or model_id.startswith(_HF_ROUTER_PREFIXES):
+        return _hf_router_client(api_key)
     
-    elif model_id.startswith("zai-org/GLM-4"):
-        # GLM models via HuggingFace Router
-        return OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-            default_headers={"X-HF-Bill-To": "huggingface"}
-        )
-    
-    elif model_id.startswith("moonshotai/Kimi-K2"):
-        # Kimi K2 models via HuggingFace Router
-        return OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-            default_headers={"X-HF-Bill-To": "huggingface"}
-        )
-    
-    else:
-        # Unknown model - try HuggingFace Inference API
-        return OpenAI(
-            base_url="https://api-inference.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN")
-        )
+    # Unknown model - try HuggingFace Inference API
+    return _hf_inference_client(api_key)
 
 
 def get_real_model_id(model_id: str) -> str:
     """Get the real model ID with provider suffixes if needed"""
-    if model_id == "zai-org/GLM-4.6":
-        # GLM-4.6 requires Cerebras provider suffix in model string for API calls
-        return "zai-org/GLM-4.6:cerebras"
-    
-    elif model_id == "MiniMaxAI/MiniMax-M2" or model_id == "MiniMaxAI/MiniMax-M2.1":
-        # MiniMax M2 and M2.1 need Novita provider suffix
-        return f"{model_id}:novita"
-    
-    elif model_id == "moonshotai/Kimi-K2-Thinking":
-        # Kimi K2 Thinking needs Together AI provider
-        return "moonshotai/Kimi-K2-Thinking:together"
-    
-    elif model_id == "moonshotai/Kimi-K2-Instruct":
-        # Kimi K2 Instruct needs Groq provider
-        return "moonshotai/Kimi-K2-Instruct:groq"
-    
-    elif model_id.startswith("deepseek-ai/DeepSeek-V3") or model_id.startswith("deepseek-ai/DeepSeek-R1"):
-        # DeepSeek V3 and R1 models need Novita provider
-        return f"{model_id}:novita"
-    
-    elif model_id == "zai-org/GLM-4.5":
-        # GLM-4.5 needs fireworks-ai provider
-        return "zai-org/GLM-4.5:fireworks-ai"
-    
-    elif model_id == "zai-org/GLM-4.7":
-        # GLM-4.7 needs cerebras provider suffix
-        return "zai-org/GLM-4.7:cerebras"
-    
-    elif model_id == "zai-org/GLM-4.7-Flash":
-        # GLM-4.7-Flash via HuggingFace Router with Novita provider
-        return "zai-org/GLM-4.7-Flash:novita"
+    real_model_id = _EXACT_MODEL_MAP.get(model_id)
+    if real_model_id is not None:
+        return real_model_id
     
-    elif model_id == "moonshotai/Kimi-K2.5":
-        # Kimi K2.5 needs Novita provider
-        return "moonshotai/Kimi-K2.5:novita"
+    for prefix, suffix in _PREFIX_SUFFIX_RULES:
+        if model_id.startswith(prefix):
+            return model_id + suffix
     
     return model_id
 
@@ -5,18 +5,169 @@ Handles parsing of various code formats including transformers.js, Python multi-
 import re
 import json
 import ast
+import functools
+import logging
 from typing import Dict, Optional
 from backend_models import get_inference_client, get_real_model_id
 
+logger = logging.getLogger(__name__)
+
+# Patterns are compiled once at import; the parsers run on every generation/deploy
+
+# parse_transformers_js_output: every fenced code block in one scan, classified by its language tag
+_FENCED_BLOCK_RE = re.compile(r'```[ \t]*(?P<lang>[\w./-]*)[ \t]*\n(?P<body>[\s\S]*?)(?:```|\Z)')
+_FENCE_LANG_TO_FILE = {
+    'html': 'index.html', 'htm': 'index.html', 'index.html': 'index.html',
+    'javascript': 'index.js', 'js': 'index.js', 'index.js': 'index.js',
+    'css': 'style.css', 'style.css': 'style.css',
+}
+
+# parse_transformers_js_output: "=== filename ===" fallback sections. Headers are found with one
+# scan; each body then runs to the first end marker (next === marker, a --- rule, or a blank line
+# followed by explanatory text), located with a plain search instead of a lazy body + lookahead
+_FILE_SECTION_HEADER_RE = re.compile(
+    r'===\s*(index\.html|index\.js|app\.js|style\.css|styles\.css)\s*===\s*\n', re.IGNORECASE
+)
+_FILE_SECTION_END_RE = re.compile(r'\n===|\n\s*---|\n\n(?:This |✨|🎨|🚀|\*\*Key Features|\*\*Design)')
+_SECTION_NAME_TO_FILE = {
+    'index.html': 'index.html',
+    'index.js': 'index.js', 'app.js': 'index.js',
+    'style.css': 'style.css', 'styles.css': 'style.css',
+}
+_BROKEN_JS_STRING_RE = re.compile(r'"\s*\n\s*([^"])')
+
+# parse_transformers_js_output: numbered sections / file headers like "1. index.html:" or "**index.html**"
+_NUMBERED_SECTION_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE | re.MULTILINE), file_key)
+    for pattern, file_key in (
+        (r'(?:^\d+\.\s*|^##\s*|^\*\*\s*)index\.html(?:\s*:|\*\*:?)\s*\n([\s\S]+?)(?=\n(?:\d+\.|##|\*\*|===)|$)', 'index.html'),
+        (r'(?:^\d+\.\s*|^##\s*|^\*\*\s*)(?:index\.js|app\.js)(?:\s*:|\*\*:?)\s*\n([\s\S]+?)(?=\n(?:\d+\.|##|\*\*|===)|$)', 'index.js'),
+        (r'(?:^\d+\.\s*|^##\s*|^\*\*\s*)(?:style\.css|styles\.css)(?:\s*:|\*\*:?)\s*\n([\s\S]+?)(?=\n(?:\d+\.|##|\*\*|===)|$)', 'style.css'),
+    )
+)
+_LEADING_FENCE_RE = re.compile(r'^```\w*\s*\n')
+_TRAILING_FENCE_RE = re.compile(r'\n```\s*$')
+
+# parse_transformers_js_output: CDN import rewrites
+_CDN_RE = re.compile(r"from\s+['\"]https://cdn.jsdelivr.net/npm/@(?:huggingface|xenova)/transformers@[^'\"]+['\"]")
+
+# parse_html_code
+_HTML_FENCE_RE = re.compile(r'```html\s*(.*?)\s*```', re.DOTALL)
+_ANY_FENCE_RE = re.compile(r'```\s*(.*?)\s*```', re.DOTALL)
+
+# parse_python_requirements / parse_multi_file_python_output
+_REQUIREMENTS_RE = re.compile(r'===\s*requirements\.txt\s*===\s*(.*?)(?====|$)', re.DOTALL | re.IGNORECASE)
+# Sections are cut with a split at each header line plus a per-chunk header match, rather than a
+# lazy body bounded by a lookahead (which re-tests the lookahead at every character)
+_MULTIFILE_SPLIT_RE = re.compile(r'\n(?=\s*===\s*\S+\.\w+\s*===)')
+_MULTIFILE_HEADER_RE = re.compile(r'\s*===\s*(\S+\.\w+)\s*===\s*')
+_FENCE_OPEN_LINE_RE = re.compile(r'^```\w*\s*', re.MULTILINE)
+_FENCE_CLOSE_LINE_RE = re.compile(r'```\s*$', re.MULTILINE)
+
+# strip_tool_call_markers
+_TOOL_CALL_RE = re.compile(r'\[/?TOOL_CALL\]', re.IGNORECASE)
+_THINK_BLOCK_RE = re.compile(r'<think>[\s\S]*?</think>', re.IGNORECASE)
+_THINK_OPEN_RE = re.compile(r'^<think>[\s\S]*?(?=\n|$)', re.IGNORECASE | re.MULTILINE)
+_THINK_CLOSE_RE = re.compile(r'</think>', re.IGNORECASE)
+_DOUBLE_BRACE_RE = re.compile(r'^\s*\}\}\s*$', re.MULTILINE)
+
+# remove_code_block
+_CODE_BLOCK_PATTERNS = (
+    re.compile(r'```(?:html|HTML)\n([\s\S]+?)\n```', re.DOTALL),  # Match ```html or ```HTML
+    re.compile(r'```\n([\s\S]+?)\n```', re.DOTALL),               # Match code blocks without language markers
+    re.compile(r'```([\s\S]+?)```', re.DOTALL),                   # Match code blocks without line breaks
+)
+
+# Built-in Python modules to exclude from generated requirements
+_BUILTIN_MODULES = frozenset({
+    'os', 'sys', 'json', 'time', 'datetime', 'random', 'math', 're', 'collections',
+    'itertools', 'functools', 'pathlib', 'urllib', 'http', 'email', 'html', 'xml',
+    'csv', 'tempfile', 'shutil', 'subprocess', 'threading', 'multiprocessing',
+    'asyncio', 'logging', 'typing', 'base64', 'hashlib', 'secrets', 'uuid',
+    'copy', 'pickle', 'io', 'contextlib', 'warnings', 'sqlite3', 'gzip', 'zipfile',
+    'tarfile', 'socket', 'ssl', 'platform', 'getpass', 'pwd', 'grp', 'stat',
+    'glob', 'fnmatch', 'linecache', 'traceback', 'inspect', 'keyword', 'token',
+    'tokenize', 'ast', 'code', 'codeop', 'dis', 'py_compile', 'compileall',
+    'importlib', 'pkgutil', 'modulefinder', 'runpy', 'site', 'sysconfig'
+})
+
+# Import name -> PyPI requirement, for the non-LLM requirements fallback
+_SPECIAL_CASE_PACKAGES = {
+    'PIL': 'Pillow',
+    'sklearn': 'scikit-learn',
+    'skimage': 'scikit-image',
+    'bs4': 'beautifulsoup4',
+    'daggr': 'daggr>=0.5.4',
+    'gradio': 'gradio>=6.0.2'
+}
+
+# extract_import_statements: "import a.b as c, d" / "from m import x, y" lines
+_IMPORT_LINE_RE = re.compile(
+    r'^[ \t]*(?:import[ \t]+([\w.]+(?:[ \t]+as[ \t]+\w+)?(?:[ \t]*,[ \t]*[\w.]+(?:[ \t]+as[ \t]+\w+)?)*)'
+    r'|from[ \t]+([\w.]+)[ \t]+import[ \t]+([^\n]+))',
+    re.MULTILINE,
+)
+
+# parse_multipage_html_output
+_FIRST_MARKER_RE = re.compile(r"^===\s*([^=\n]+?)\s*===", re.MULTILINE)
+_MULTIPAGE_SPLIT_RE = re.compile(r"\n(?====\s*[^=\n]+?\s*===)")
+_MULTIPAGE_HEADER_RE = re.compile(r"===\s*([^=\n]+?)\s*===\s*\n")
+_STRAY_FENCE_RE = re.compile(r"^```\w*\s*\n|\n```\s*$")
+
+# enforce_critical_versions
+_DAGGR_RE = re.compile(r'^daggr\s*(?=[#\n]|$)', re.MULTILINE)
+_GRADIO_RE = re.compile(r'^gradio\s*(?=[#\n]|$)', re.MULTILINE)
+
+
+def _memoized_parser(func):
+    """Memoize a pure text parser on its input string.
+
+    The same generated code is parsed several times per deploy (preview, file split,
+    requirements), so results are kept in a small LRU. Only the last few outputs are
+    kept: each entry pins a whole LLM response and its parsed files in memory, per parser,
+    and repeats only happen within one deploy. Dict results are copied on the way out
+    because callers add files to them.
+    """
+    cached = functools.lru_cache(maxsize=4)(func)
+
+    @functools.wraps(func)
+    def wrapper(text):
+        result = cached(text)
+        return dict(result) if isinstance(result, dict) else result
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+def _all_files_found(files: Dict[str, str]) -> bool:
+    """True once index.html, index.js and style.css all have content"""
+    return bool(files['index.html'] and files['index.js'] and files['style.css'])
+
 
+def _find_file_sections(code: str) -> Dict[str, str]:
+    """Map index.html/index.js/style.css to the body of their first "=== filename ===" section"""
+    sections = {}
+    for header in _FILE_SECTION_HEADER_RE.finditer(code):
+        file_key = _SECTION_NAME_TO_FILE[header.group(1).lower()]
+        if file_key in sections:
+            continue
+        # Bodies are at least one character long, so an end marker can't start right at the header
+        end = _FILE_SECTION_END_RE.search(code, header.end() + 1)
+        sections[file_key] = code[header.end():end.start() if end else len(code)]
+    return sections
+
+
+@_memoized_parser
 def parse_transformers_js_output(code: str) -> Dict[str, str]:
     """Parse transformers.js output into separate files (index.html, index.js, style.css)
     
     Uses comprehensive parsing patterns to handle various LLM output formats.
     Updated to use transformers.js v3.8.0 CDN.
     """
-    print(f"[Parser] Received code length: {len(code)} characters")
-    print(f"[Parser] First 200 chars: {code[:200]}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[Parser] Received code length: %d characters", len(code))
+        logger.debug("[Parser] First 200 chars: %s", code[:200])
     
     files = {
         'index.html': '',
@@ -24,132 +175,84 @@ def parse_transformers_js_output(code: str) -> Dict[str, str]:
         'style.css': ''
     }
     
-    # Multiple patterns to match the three code blocks with different variations
-    html_patterns = [
-        r'```html\s*\n([\s\S]*?)(?:```|\Z)',
-        r'```htm\s*\n([\s\S]*?)(?:```|\Z)',
-        r'```\s*(?:index\.html|html)\s*\n([\s\S]*?)(?:```|\Z)'
-    ]
-    
-    js_patterns = [
-        r'```javascript\s*\n([\s\S]*?)(?:```|\Z)',
-        r'```js\s*\n([\s\S]*?)(?:```|\Z)',
-        r'```\s*(?:index\.js|javascript|js)\s*\n([\s\S]*?)(?:```|\Z)'
-    ]
-    
-    css_patterns = [
-        r'```css\s*\n([\s\S]*?)(?:```|\Z)',
-        r'```\s*(?:style\.css|css)\s*\n([\s\S]*?)(?:```|\Z)'
-    ]
-    
-    # Extract HTML content
-    for pattern in html_patterns:
-        html_match = re.search(pattern, code, re.IGNORECASE)
-        if html_match:
-            files['index.html'] = html_match.group(1).strip()
-            break
-    
-    # Extract JavaScript content
-    for pattern in js_patterns:
-        js_match = re.search(pattern, code, re.IGNORECASE)
-        if js_match:
-            files['index.js'] = js_match.group(1).strip()
-            break
-    
-    # Extract CSS content
-    for pattern in css_patterns:
-        css_match = re.search(pattern, code, re.IGNORECASE)
-        if css_match:
-            files['style.css'] = css_match.group(1).strip()
-            break
+    # Extract HTML/JavaScript/CSS content from fenced code blocks (first block of each kind wins)
+    for block in _FENCED_BLOCK_RE.finditer(code):
+        file_key = _FENCE_LANG_TO_FILE.get(block.group('lang').lower())
+        if file_key and not files[file_key]:
+            files[file_key] = block.group('body').strip()
+            if _all_files_found(files):
+                break
     
     # Fallback: support === index.html === format if any file is missing
-    if not (files['index.html'] and files['index.js'] and files['style.css']):
-        # Use regex to extract sections - support alternative filenames
-        # Stop at next === marker, or common end markers
-        # More aggressive: stop at blank line followed by explanatory text patterns
-        html_fallback = re.search(r'===\s*index\.html\s*===\s*\n([\s\S]+?)(?=\n===|\n\s*---|\n\n(?:This |✨|🎨|🚀|\*\*Key Features|\*\*Design)|$)', code, re.IGNORECASE)
+    if not _all_files_found(files):
+        # Extract sections - support alternative filenames (app.js, styles.css)
+        sections = _find_file_sections(code)
+        html_fallback = sections.get('index.html')
+        js_fallback = sections.get('index.js')
+        css_fallback = sections.get('style.css')
         
-        # Try both index.js and app.js  
-        js_fallback = re.search(r'===\s*(?:index\.js|app\.js)\s*===\s*\n([\s\S]+?)(?=\n===|\n\s*---|\n\n(?:This |✨|🎨|🚀|\*\*Key Features|\*\*Design)|$)', code, re.IGNORECASE)
-        
-        # Try both style.css and styles.css
-        css_fallback = re.search(r'===\s*(?:style\.css|styles\.css)\s*===\s*\n([\s\S]+?)(?=\n===|\n\s*---|\n\n(?:This |✨|🎨|🚀|\*\*Key Features|\*\*Design)|$)', code, re.IGNORECASE)
-        
-        print(f"[Parser] Fallback extraction - HTML found: {bool(html_fallback)}, JS found: {bool(js_fallback)}, CSS found: {bool(css_fallback)}")
+        logger.debug("[Parser] Fallback extraction - HTML found: %s, JS found: %s, CSS found: %s",
+                     bool(html_fallback), bool(js_fallback), bool(css_fallback))
         
         if html_fallback:
-            files['index.html'] = html_fallback.group(1).strip()
+            files['index.html'] = html_fallback.strip()
         if js_fallback:
-            js_content = js_fallback.group(1).strip()
+            js_content = js_fallback.strip()
             # Fix common JavaScript syntax issues from LLM output
             # Fix line breaks in string literals (common LLM mistake)
-            js_content = re.sub(r'"\s*\n\s*([^"])', r'" + "\1', js_content)  # Fix broken strings
+            js_content = _BROKEN_JS_STRING_RE.sub(r'" + "\1', js_content)  # Fix broken strings
             files['index.js'] = js_content
         if css_fallback:
-            css_content = css_fallback.group(1).strip()
+            css_content = css_fallback.strip()
             files['style.css'] = css_content
             
             # Also normalize HTML to reference style.css (singular)
             if files['index.html'] and 'styles.css' in files['index.html']:
-                print("[Parser] Normalizing styles.css reference to style.css in HTML")
+                logger.debug("[Parser] Normalizing styles.css reference to style.css in HTML")
                 files['index.html'] = files['index.html'].replace('href="styles.css"', 'href="style.css"')
                 files['index.html'] = files['index.html'].replace("href='styles.css'", "href='style.css'")
     
     # Additional fallback: extract from numbered sections or file headers
-    if not (files['index.html'] and files['index.js'] and files['style.css']):
+    if not _all_files_found(files):
         # Try patterns like "1. index.html:" or "**index.html**"
-        patterns = [
-            (r'(?:^\d+\.\s*|^##\s*|^\*\*\s*)index\.html(?:\s*:|\*\*:?)\s*\n([\s\S]+?)(?=\n(?:\d+\.|##|\*\*|===)|$)', 'index.html'),
-            (r'(?:^\d+\.\s*|^##\s*|^\*\*\s*)(?:index\.js|app\.js)(?:\s*:|\*\*:?)\s*\n([\s\S]+?)(?=\n(?:\d+\.|##|\*\*|===)|$)', 'index.js'),
-            (r'(?:^\d+\.\s*|^##\s*|^\*\*\s*)(?:style\.css|styles\.css)(?:\s*:|\*\*:?)\s*\n([\s\S]+?)(?=\n(?:\d+\.|##|\*\*|===)|$)', 'style.css')
-        ]
-        
-        for pattern, file_key in patterns:
+        for pattern, file_key in _NUMBERED_SECTION_PATTERNS:
             if not files[file_key]:
-                match = re.search(pattern, code, re.IGNORECASE | re.MULTILINE)
+                match = pattern.search(code)
                 if match:
                     # Clean up the content by removing any code block markers
                     content = match.group(1).strip()
-                    content = re.sub(r'^```\w*\s*\n', '', content)
-                    content = re.sub(r'\n```\s*$', '', content)
+                    if content.startswith('```'):
+                        content = _LEADING_FENCE_RE.sub('', content)
+                    if content.endswith('```'):
+                        content = _TRAILING_FENCE_RE.sub('', content)
                     files[file_key] = content.strip()
     
     # Normalize filename references in HTML
     if files['index.html'] and files['style.css']:
         if 'styles.css' in files['index.html']:
-            print("[Parser] Normalizing styles.css reference to style.css in HTML")
+            logger.debug("[Parser] Normalizing styles.css reference to style.css in HTML")
             files['index.html'] = files['index.html'].replace('href="styles.css"', 'href="style.css"')
             files['index.html'] = files['index.html'].replace("href='styles.css'", "href='style.css'")
     
     if files['index.html'] and files['index.js']:
         if 'app.js' in files['index.html']:
-            print("[Parser] Normalizing app.js reference to index.js in HTML")
+            logger.debug("[Parser] Normalizing app.js reference to index.js in HTML")
             files['index.html'] = files['index.html'].replace('src="app.js"', 'src="index.js"')
             files['index.html'] = files['index.html'].replace("src='app.js'", "src='index.js'")
     
     # Normalize transformers.js imports to use v3.8.0 CDN
-    cdn_url = "https://cdn.jsdelivr.net/npm/@huggingface/transformers@3.8.0"
+    cdn_import = "from 'https://cdn.jsdelivr.net/npm/@huggingface/transformers@3.8.0'"
     
     for file_key in ['index.html', 'index.js']:
-        if files[file_key]:
-            content = files[file_key]
-            # Update import statements to use latest CDN
-            content = re.sub(
-                r"from\s+['\"]https://cdn.jsdelivr.net/npm/@huggingface/transformers@[^'\"]+['\"]",
-                f"from '{cdn_url}'",
-                content
-            )
-            content = re.sub(
-                r"from\s+['\"]https://cdn.jsdelivr.net/npm/@xenova/transformers@[^'\"]+['\"]",
-                f"from '{cdn_url}'",
-                content
-            )
-            files[file_key] = content
+        # Literal probe first - most outputs have no jsDelivr imports to rewrite
+        if files[file_key] and 'cdn.jsdelivr.net/npm/@' in files[file_key]:
+            # Update @huggingface and legacy @xenova import statements to use latest CDN
+            files[file_key] = _CDN_RE.sub(cdn_import, files[file_key])
     
     return files
 
 
+@_memoized_parser
 def parse_html_code(code: str) -> str:
     """Extract HTML code from various formats"""
     code = code.strip()
@@ -160,12 +263,12 @@ def parse_html_code(code: str) -> str:
     
     # Try to extract from code blocks
     if '```html' in code:
-        match = re.search(r'```html\s*(.*?)\s*```', code, re.DOTALL)
+        match = _HTML_FENCE_RE.search(code)
         if match:
             return match.group(1).strip()
     
     if '```' in code:
-        match = re.search(r'```\s*(.*?)\s*```', code, re.DOTALL)
+        match = _ANY_FENCE_RE.search(code)
         if match:
             return match.group(1).strip()
     
@@ -175,34 +278,35 @@ def parse_html_code(code: str) -> str:
 def parse_python_requirements(code: str) -> Optional[str]:
     """Extract requirements.txt content from code if present"""
     # Look for requirements.txt section
-    req_pattern = r'===\s*requirements\.txt\s*===\s*(.*?)(?====|$)'
-    match = re.search(req_pattern, code, re.DOTALL | re.IGNORECASE)
+    match = _REQUIREMENTS_RE.search(code)
     
     if match:
         requirements = match.group(1).strip()
         # Clean up code blocks
-        requirements = re.sub(r'^```\w*\s*', '', requirements, flags=re.MULTILINE)
-        requirements = re.sub(r'```\s*$', '', requirements, flags=re.MULTILINE)
+        requirements = _FENCE_OPEN_LINE_RE.sub('', requirements)
+        requirements = _FENCE_CLOSE_LINE_RE.sub('', requirements)
         return requirements
     
     return None
 
 
+@_memoized_parser
 def parse_multi_file_python_output(code: str) -> Dict[str, str]:
     """Parse multi-file Python output (e.g., Gradio, Streamlit)"""
     files = {}
     
-    # Pattern to match file sections like === filename.ext ===
-    pattern = r'===\s*(\S+\.\w+)\s*===\s*(.*?)(?=\n\s*===\s*\S+\.\w+\s*===|$)'
-    matches = re.finditer(pattern, code, re.DOTALL | re.IGNORECASE)
-    
-    for match in matches:
-        filename = match.group(1).strip()
-        content = match.group(2).strip()
+    # Split into file sections like === filename.ext ===
+    for index, chunk in enumerate(_MULTIFILE_SPLIT_RE.split(code)):
+        # Only the first chunk can have text before its header
+        header = _MULTIFILE_HEADER_RE.search(chunk) if index == 0 else _MULTIFILE_HEADER_RE.match(chunk)
+        if not header:
+            continue
+        filename = header.group(1).strip()
+        content = chunk[header.end():].strip()
         
         # Clean up code blocks
-        content = re.sub(r'^```\w*\s*', '', content, flags=re.MULTILINE)
-        content = re.sub(r'```\s*$', '', content, flags=re.MULTILINE)
+        content = _FENCE_OPEN_LINE_RE.sub('', content)
+        content = _FENCE_CLOSE_LINE_RE.sub('', content)
         
         if filename == "requirements.txt":
             content = enforce_critical_versions(content)
@@ -211,37 +315,42 @@ def parse_multi_file_python_output(code: str) -> Dict[str, str]:
     return files
 
 
+@_memoized_parser
 def strip_tool_call_markers(text):
     """Remove TOOL_CALL markers and thinking tags that some LLMs add to their output."""
     if not text:
         return text
+    # Most outputs contain none of these markers, so probe with substring checks
+    # before running each substitution
+    lowered = text.lower()
     # Remove [TOOL_CALL] and [/TOOL_CALL] markers
-    text = re.sub(r'\[/?TOOL_CALL\]', '', text, flags=re.IGNORECASE)
-    # Remove <think> and </think> tags and their content
-    text = re.sub(r'<think>[\s\S]*?</think>', '', text, flags=re.IGNORECASE)
-    # Remove any remaining unclosed <think> tags at the start
-    text = re.sub(r'^<think>[\s\S]*?(?=\n|$)', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    if '_call]' in lowered:
+        text = _TOOL_CALL_RE.sub('', text)
+        lowered = text.lower()
+    if '<think>' in lowered:
+        # Remove <think> and </think> tags and their content
+        text = _THINK_BLOCK_RE.sub('', text)
+        # Remove any remaining unclosed <think> tags at the start
+        text = _THINK_OPEN_RE.sub('', text)
     # Remove any remaining </think> tags
-    text = re.sub(r'</think>', '', text, flags=re.IGNORECASE)
+    if '</think>' in lowered:
+        text = _THINK_CLOSE_RE.sub('', text)
     # Remove standalone }} that appears with tool calls
     # Only remove if it's on its own line or at the end
-    text = re.sub(r'^\s*\}\}\s*$', '', text, flags=re.MULTILINE)
+    if '}}' in text:
+        text = _DOUBLE_BRACE_RE.sub('', text)
     return text.strip()
 
 
+@_memoized_parser
 def remove_code_block(text):
     """Remove code block markers from text."""
     # First strip any tool call markers
     text = strip_tool_call_markers(text)
     
     # Try to match code blocks with language markers
-    patterns = [
-        r'```(?:html|HTML)\n([\s\S]+?)\n```',  # Match ```html or ```HTML
-        r'```\n([\s\S]+?)\n```',               # Match code blocks without language markers
-        r'```([\s\S]+?)```'                      # Match code blocks without line breaks
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL)
+    for pattern in _CODE_BLOCK_PATTERNS:
+        match = pattern.search(text)
         if match:
             extracted = match.group(1).strip()
             # Remove a leading language marker line (e.g., 'python') if present
@@ -256,54 +365,69 @@ def extract_import_statements(code):
     """Extract import statements from generated code."""
     import_statements = []
     
-    # Built-in Python modules to exclude
-    builtin_modules = {
-        'os', 'sys', 'json', 'time', 'datetime', 'random', 'math', 're', 'collections',
-        'itertools', 'functools', 'pathlib', 'urllib', 'http', 'email', 'html', 'xml',
-        'csv', 'tempfile', 'shutil', 'subprocess', 'threading', 'multiprocessing',
-        'asyncio', 'logging', 'typing', 'base64', 'hashlib', 'secrets', 'uuid',
-        'copy', 'pickle', 'io', 'contextlib', 'warnings', 'sqlite3', 'gzip', 'zipfile',
-        'tarfile', 'socket', 'ssl', 'platform', 'getpass', 'pwd', 'grp', 'stat',
-        'glob', 'fnmatch', 'linecache', 'traceback', 'inspect', 'keyword', 'token',
-        'tokenize', 'ast', 'code', 'codeop', 'dis', 'py_compile', 'compileall',
-        'importlib', 'pkgutil', 'modulefinder', 'runpy', 'site', 'sysconfig'
-    }
-    
     try:
-        # Try to parse as Python AST
+        # Parse as Python AST (import-like text inside strings and docstrings is ignored)
         tree = ast.parse(code)
         
         for node in ast.walk(tree):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     module_name = alias.name.split('.')[0]
-                    if module_name not in builtin_modules and not module_name.startswith('_'):
+                    if module_name not in _BUILTIN_MODULES and not module_name.startswith('_'):
                         import_statements.append(f"import {alias.name}")
             
             elif isinstance(node, ast.ImportFrom):
                 if node.module:
                     module_name = node.module.split('.')[0]
-                    if module_name not in builtin_modules and not module_name.startswith('_'):
+                    if module_name not in _BUILTIN_MODULES and not module_name.startswith('_'):
                         names = [alias.name for alias in node.names]
                         import_statements.append(f"from {node.module} import {', '.join(names)}")
-    
+        
+        return list(dict.fromkeys(import_statements))  # Remove duplicates, keeping source order
     except SyntaxError:
-        # Fallback: use regex to find import statements
-        for line in code.split('\n'):
-            line = line.strip()
-            if line.startswith('import ') or line.startswith('from '):
-                # Check if it's not a builtin module
-                if line.startswith('import '):
-                    module_name = line.split()[1].split('.')[0]
-                elif line.startswith('from '):
-                    module_name = line.split()[1].split('.')[0]
-                
-                if module_name not in builtin_modules and not module_name.startswith('_'):
-                    import_statements.append(line)
-    
-    return list(set(import_statements))  # Remove duplicates
+        # Not valid Python - fall back to the line scan
+        pass
+    
+    # Indented imports are kept too (e.g. optional imports inside try/except)
+    for match in _IMPORT_LINE_RE.finditer(code):
+        imported, from_module, from_names = match.groups()
+        if imported:
+            for part in imported.split(','):
+                name = part.split()[0]
+                module_name = name.split('.')[0]
+                if module_name not in _BUILTIN_MODULES and not module_name.startswith('_'):
+                    import_statements.append(f"import {name}")
+        else:
+            # Like the AST path, relative imports keep their module name without the dots,
+            # and "from . import x" (no module) is skipped
+            from_module = from_module.lstrip('.')
+            module_name = from_module.split('.')[0]
+            if module_name and module_name not in _BUILTIN_MODULES and not module_name.startswith('_'):
+                names_text = from_names.split('#', 1)[0].strip(' \t()\\')
+                names = [name.split()[0] for name in names_text.split(',') if name.strip()]
+                import_statements.append(f"from {from_module} import {', '.join(names)}")
+    
+    return list(dict.fromkeys(import_statements))  # Remove duplicates, keeping source order
+
+
+def _strip_stray_fences(content: str) -> str:
+    """Remove a leading/trailing markdown fence from stripped section content"""
+    # Content is already stripped, so a fence can only be present at the very start or end
+    if content.startswith('```') or content.endswith('```'):
+        content = _STRAY_FENCE_RE.sub("", content)
+    return content
+
 
+def _iter_multipage_sections(text: str):
+    """Yield (name, content) for each "=== name ===" section, splitting at header lines"""
+    for chunk in _MULTIPAGE_SPLIT_RE.split(text):
+        # Every chunk starts at a line beginning, so a header can only sit at its start
+        header = _MULTIPAGE_HEADER_RE.match(chunk)
+        if header:
+            yield header.group(1).strip(), chunk[header.end():].strip()
 
+
+@_memoized_parser
 def parse_multipage_html_output(text: str) -> Dict[str, str]:
     """Parse multi-page HTML output formatted as repeated "=== filename ===" sections.
 
@@ -317,7 +441,7 @@ def parse_multipage_html_output(text: str) -> Dict[str, str]:
     files: Dict[str, str] = {}
     
     # Check if there's content before the first === marker
-    first_marker_match = re.search(r"^===\s*([^=\n]+?)\s*===", cleaned, re.MULTILINE)
+    first_marker_match = _FIRST_MARKER_RE.search(cleaned)
     if first_marker_match:
         # There's content before the first marker
         first_marker_pos = first_marker_match.start()
@@ -329,22 +453,14 @@ def parse_multipage_html_output(text: str) -> Dict[str, str]:
         
         # Now parse the rest with === markers
         remaining_text = cleaned[first_marker_pos:] if first_marker_pos > 0 else cleaned
-        pattern = re.compile(r"^===\s*([^=\n]+?)\s*===\s*\n([\s\S]*?)(?=\n===\s*[^=\n]+?\s*===|\Z)", re.MULTILINE)
-        for m in pattern.finditer(remaining_text):
-            name = m.group(1).strip()
-            content = m.group(2).strip()
+        for name, content in _iter_multipage_sections(remaining_text):
             # Remove accidental trailing fences if present
-            content = re.sub(r"^```\w*\s*\n|\n```\s*$", "", content)
-            files[name] = content
+            files[name] = _strip_stray_fences(content)
     else:
         # No === markers found, try standard pattern matching
-        pattern = re.compile(r"^===\s*([^=\n]+?)\s*===\s*\n([\s\S]*?)(?=\n===\s*[^=\n]+?\s*===|\Z)", re.MULTILINE)
-        for m in pattern.finditer(cleaned):
-            name = m.group(1).strip()
-            content = m.group(2).strip()
+        for name, content in _iter_multipage_sections(cleaned):
             # Remove accidental trailing fences if present
-            content = re.sub(r"^```\w*\s*\n|\n```\s*$", "", content)
-            files[name] = content
+            files[name] = _strip_stray_fences(content)
     
     return files
 
@@ -372,29 +488,29 @@ def enforce_critical_versions(requirements_content: str) -> str:
         # Check if version is already specified
         if 'daggr>=' not in requirements_content and 'daggr==' not in requirements_content:
             # Replace plain 'daggr' with pinned version, preserving comments
-            requirements_content = re.sub(r'^daggr\s*(?=[#\n]|$)', 'daggr>=0.5.4', requirements_content, flags=re.MULTILINE)
+            requirements_content = _DAGGR_RE.sub('daggr>=0.5.4', requirements_content)
     
     if 'gradio' in requirements_content:
         if 'gradio>=' not in requirements_content and 'gradio==' not in requirements_content:
             # Replace plain 'gradio' with pinned version, preserving comments
-            requirements_content = re.sub(r'^gradio\s*(?=[#\n]|$)', 'gradio>=6.0.2', requirements_content, flags=re.MULTILINE)
+            requirements_content = _GRADIO_RE.sub('gradio>=6.0.2', requirements_content)
             
     return requirements_content
 
 
-def generate_requirements_txt_with_llm(import_statements):
-    """Generate requirements.txt content using LLM based on import statements."""
-    if not import_statements:
-        return "# No additional dependencies required\n"
-    
-    # Use a lightweight model for this task
-    try:
-        client = get_inference_client("zai-org/GLM-4.7", "auto")
-        actual_model_id = get_real_model_id("zai-org/GLM-4.7")
-        
-        imports_text = '\n'.join(import_statements)
-        
-        prompt = f"""Based on the following Python import statements, generate a comprehensive requirements.txt file with all necessary and commonly used related packages:
+# generate_requirements_txt_with_llm: acceptance test for a (stripped) line of LLM output.
+# Rejects markdown/explanatory lines (fences, non-comment "#" headers, bold, bullet lists,
+# dividers, lines starting with here/this/the/based on, empty lines), then keeps comments
+# ("# "), git+ dependencies, lines starting alphanumeric, and anything with ==, >= or <=
+_REQUIREMENT_LINE_RE = re.compile(
+    r'(?!```|#(?! )|\*\*|\*(?![^\W_])|-(?![^\W_])|===|---|(?i:here|this|the|based on))'
+    r'(?:# |git\+|[^\W_]|.*(?:==|>=|<=))'
+)
+
+# generate_requirements_txt_with_llm prompts (static apart from the import list)
+_REQUIREMENTS_SYSTEM_PROMPT = "You are a Python packaging expert specializing in creating comprehensive, production-ready requirements.txt files. Output ONLY plain text package names without any markdown formatting, code blocks, or explanatory text. Your goal is to ensure applications work smoothly by including not just direct dependencies but also commonly needed companion packages, popular extensions, and supporting libraries that developers typically need together."
+
+_REQUIREMENTS_PROMPT_TEMPLATE = """Based on the following Python import statements, generate a comprehensive requirements.txt file with all necessary and commonly used related packages:
 
 {imports_text}
 
@@ -433,91 +549,91 @@ Instructions:
 
 Generate a comprehensive requirements.txt that ensures the application will work smoothly:"""
 
-        messages = [
-            {"role": "system", "content": "You are a Python packaging expert specializing in creating comprehensive, production-ready requirements.txt files. Output ONLY plain text package names without any markdown formatting, code blocks, or explanatory text. Your goal is to ensure applications work smoothly by including not just direct dependencies but also commonly needed companion packages, popular extensions, and supporting libraries that developers typically need together."},
-            {"role": "user", "content": prompt}
-        ]
+
+# generate_requirements_txt_with_llm: import sets this small that only touch builtin or
+# special-case modules are resolved locally instead of asking the LLM
+_LOCAL_REQUIREMENTS_MAX_IMPORTS = 5
+
+
+def _import_module_name(stmt: str) -> Optional[str]:
+    """Top-level module of an "import x" / "from x import y" statement"""
+    if stmt.startswith('import ') or stmt.startswith('from '):
+        return stmt.split()[1].split('.')[0]
+    return None
+
+
+def _local_requirements(module_names) -> str:
+    """Map module names to package names via _SPECIAL_CASE_PACKAGES, no LLM involved"""
+    dependencies = {_SPECIAL_CASE_PACKAGES.get(name, name) for name in module_names if name}
+    if dependencies:
+        return '\n'.join(sorted(dependencies)) + '\n'
+    return "# No additional dependencies required\n"
+
+
+@functools.lru_cache(maxsize=32)
+def _llm_requirements(import_statements: tuple) -> str:
+    """Ask the LLM for requirements.txt content; raises on any client/model failure.
+
+    Cached per import set (failures are not cached, so they are retried next call).
+    """
+    # Use a lightweight model for this task
+    client = get_inference_client("zai-org/GLM-4.7", "auto")
+    actual_model_id = get_real_model_id("zai-org/GLM-4.7")
+    
+    prompt = _REQUIREMENTS_PROMPT_TEMPLATE.format(imports_text='\n'.join(import_statements))
+    
+    messages = [
+        {"role": "system", "content": _REQUIREMENTS_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    
+    response = client.chat.completions.create(
+        model=actual_model_id,
+        messages=messages,
+        max_tokens=1024,
+        temperature=0.1
+    )
+    
+    requirements_content = response.choices[0].message.content.strip()
+    
+    # Clean up the response in case it includes extra formatting
+    if '```' in requirements_content:
+        requirements_content = remove_code_block(requirements_content)
+    
+    # Enhanced cleanup for markdown and formatting: keep only lines that look like
+    # package specifications (see _REQUIREMENT_LINE_RE for the exact rules)
+    clean_lines = [line for line in requirements_content.split('\n') if _REQUIREMENT_LINE_RE.match(line.strip())]
+    
+    requirements_content = '\n'.join(clean_lines).strip()
+    
+    requirements_content = enforce_critical_versions(requirements_content)
+    
+    # Ensure it ends with a newline
+    if requirements_content and not requirements_content.endswith('\n'):
+        requirements_content += '\n'
         
-        response = client.chat.completions.create(
-            model=actual_model_id,
-            messages=messages,
-            max_tokens=1024,
-            temperature=0.1
+    return requirements_content if requirements_content else "# No additional dependencies required\n"
+
+
+def generate_requirements_txt_with_llm(import_statements):
+    """Generate requirements.txt content using LLM based on import statements."""
+    if not import_statements:
+        return "# No additional dependencies required\n"
+    
+    module_names = [_import_module_name(stmt) for stmt in import_statements]
+    
+    # Fast path: a handful of well-known modules doesn't need an LLM roundtrip
+    if len(import_statements) < _LOCAL_REQUIREMENTS_MAX_IMPORTS and all(
+        name in _BUILTIN_MODULES or name in _SPECIAL_CASE_PACKAGES for name in module_names
+    ):
+        return enforce_critical_versions(
+            _local_requirements(name for name in module_names if name not in _BUILTIN_MODULES)
         )
-        
-        requirements_content = response.choices[0].message.content.strip()
-        
-        # Clean up the response in case it includes extra formatting
-        if '```' in requirements_content:
-            requirements_content = remove_code_block(requirements_content)
-        
-        # Enhanced cleanup for markdown and formatting
-        lines = requirements_content.split('\n')
-        clean_lines = []
-        for line in lines:
-            stripped_line = line.strip()
-            
-            # Skip lines that are markdown formatting
-            if (stripped_line == '```' or 
-                stripped_line.startswith('```') or
-                stripped_line.startswith('#') and not stripped_line.startswith('# ') or  # Skip markdown headers but keep comments
-                stripped_line.startswith('**') or  # Skip bold text
-                stripped_line.startswith('*') and not stripped_line[1:2].isalnum() or  # Skip markdown lists but keep package names starting with *
-                stripped_line.startswith('-') and not stripped_line[1:2].isalnum() or  # Skip markdown lists but keep package names starting with -
-                stripped_line.startswith('===') or  # Skip section dividers
-                stripped_line.startswith('---') or  # Skip horizontal rules
-                stripped_line.lower().startswith('here') or  # Skip explanatory text
-                stripped_line.lower().startswith('this') or  # Skip explanatory text
-                stripped_line.lower().startswith('the') or  # Skip explanatory text
-                stripped_line.lower().startswith('based on') or  # Skip explanatory text
-                stripped_line == ''):  # Skip empty lines unless they're at natural boundaries
-                continue
-            
-            # Keep lines that look like valid package specifications
-            # Valid lines: package names, git+https://, comments starting with "# "
-            if (stripped_line.startswith('# ') or  # Valid comments
-                stripped_line.startswith('git+') or  # Git dependencies
-                stripped_line[0].isalnum() or  # Package names start with alphanumeric
-                '==' in stripped_line or  # Version specifications
-                '>=' in stripped_line or  # Version specifications
-                '<=' in stripped_line):  # Version specifications
-                clean_lines.append(line)
-        
-        requirements_content = '\n'.join(clean_lines).strip()
-        
-        requirements_content = enforce_critical_versions(requirements_content)
-        
-        # Ensure it ends with a newline
-        if requirements_content and not requirements_content.endswith('\n'):
-            requirements_content += '\n'
-            
-        return requirements_content if requirements_content else "# No additional dependencies required\n"
-        
+    
+    try:
+        # Sorted so the same import set hits the cache regardless of order
+        return _llm_requirements(tuple(sorted(set(import_statements))))
     except Exception as e:
         # Fallback: simple extraction with basic mapping
-        print(f"[Parser] Warning: LLM requirements generation failed: {e}, using fallback")
-        dependencies = set()
-        special_cases = {
-            'PIL': 'Pillow', 
-            'sklearn': 'scikit-learn',
-            'skimage': 'scikit-image',
-            'bs4': 'beautifulsoup4',
-            'daggr': 'daggr>=0.5.4',
-            'gradio': 'gradio>=6.0.2'
-        }
-        
-        for stmt in import_statements:
-            if stmt.startswith('import '):
-                module_name = stmt.split()[1].split('.')[0]
-                package_name = special_cases.get(module_name, module_name)
-                dependencies.add(package_name)
-            elif stmt.startswith('from '):
-                module_name = stmt.split()[1].split('.')[0]
-                package_name = special_cases.get(module_name, module_name)
-                dependencies.add(package_name)
-        
-        if dependencies:
-            return '\n'.join(sorted(dependencies)) + '\n'
-        else:
-            return "# No additional dependencies required\n"
-
+        logger.warning("[Parser] LLM requirements generation failed: %s, using fallback", e)
+        return _local_requirements(module_names)
@@ -2,21 +2,39 @@
 Standalone system prompts for AnyCoder backend.
 No dependencies on Gradio or other heavy libraries.
 """
+import functools
+import hashlib
+import logging
+import sys
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _backend_docs():
+    """Import the backend documentation manager (Gradio 6, transformers.js and ComfyUI docs)
+    on first use, so callers of the static prompts never load it. None if unavailable.
+    Cached, so the unavailable warning is logged once per process."""
+    try:
+        import backend_docs_manager
+    except ImportError:
+        logger.warning("backend_docs_manager not available, using fallback prompts")
+        return None
+    return backend_docs_manager
+
+
+# Boilerplate shared by most of the prompts below. Prompts are interned so every
+# reference (including caller-side prompt-cache keys) resolves to a single object
+_README_WARNING = sys.intern("""**🚨 CRITICAL: DO NOT Generate README.md Files**
+- NEVER generate README.md files under any circumstances
+- A template README.md is automatically provided and will be overridden by the deployment system
+- Generating a README.md will break the deployment process""")
 
-# Import the backend documentation manager for Gradio 6, transformers.js, and ComfyUI docs
-try:
-    from backend_docs_manager import build_gradio_system_prompt, build_transformersjs_system_prompt, build_comfyui_system_prompt
-    HAS_BACKEND_DOCS = True
-except ImportError:
-    HAS_BACKEND_DOCS = False
-    print("Warning: backend_docs_manager not available, using fallback prompts")
+_BUILT_WITH = sys.intern('IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder')
 
-HTML_SYSTEM_PROMPT = """ONLY USE HTML, CSS AND JAVASCRIPT. If you want to use ICON make sure to import the library first. Try to create the best UI possible by using only HTML, CSS and JAVASCRIPT. MAKE IT RESPONSIVE USING MODERN CSS. Use as much as you can modern CSS for the styling, if you can't do something with modern CSS, then use custom CSS. Also, try to elaborate as much as you can, to create something unique. ALWAYS GIVE THE RESPONSE INTO A SINGLE HTML FILE
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-- NEVER generate README.md files under any circumstances
-- A template README.md is automatically provided and will be overridden by the deployment system
-- Generating a README.md will break the deployment process
+HTML_SYSTEM_PROMPT = sys.intern("""ONLY USE HTML, CSS AND JAVASCRIPT. If you want to use ICON make sure to import the library first. Try to create the best UI possible by using only HTML, CSS and JAVASCRIPT. MAKE IT RESPONSIVE USING MODERN CSS. Use as much as you can modern CSS for the styling, if you can't do something with modern CSS, then use custom CSS. Also, try to elaborate as much as you can, to create something unique. ALWAYS GIVE THE RESPONSE INTO A SINGLE HTML FILE
 
 If an image is provided, analyze it and use the visual information to better understand the user's requirements.
 
@@ -24,22 +42,13 @@ Always respond with code that can be executed or rendered directly.
 
 Generate complete, working HTML code that can be run immediately.
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder"""
+""" + _README_WARNING + """
 
+""" + _BUILT_WITH)
 
-# Transformers.js system prompt - dynamically loaded with full transformers.js documentation
-def get_transformersjs_system_prompt() -> str:
-    """Get the complete transformers.js system prompt with full documentation"""
-    if HAS_BACKEND_DOCS:
-        return build_transformersjs_system_prompt()
-    else:
-        # Fallback prompt if documentation manager is not available
-        return """You are an expert web developer creating a transformers.js application. You will generate THREE separate files: index.html, index.js, and style.css.
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-- NEVER generate README.md files under any circumstances
-- A template README.md is automatically provided and will be overridden by the deployment system
-- Generating a README.md will break the deployment process
+# Fallback prompt if documentation manager is not available
+_FALLBACK_TRANSFORMERSJS = sys.intern("""You are an expert web developer creating a transformers.js application. You will generate THREE separate files: index.html, index.js, and style.css.
 
 **🚨 CRITICAL: Required Output Format**
 
@@ -122,14 +131,21 @@ const pipe = await pipeline('sentiment-analysis', 'Xenova/distilbert-base-uncase
 });
 ```
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder
-"""
+""" + _README_WARNING + """
 
-# Legacy variable for backward compatibility - now dynamically generated
-TRANSFORMERS_JS_SYSTEM_PROMPT = get_transformersjs_system_prompt()
+""" + _BUILT_WITH + """
+""")
 
 
-STREAMLIT_SYSTEM_PROMPT = """You are an expert Streamlit developer. Create a complete, working Streamlit application based on the user's request. Generate all necessary code to make the application functional and runnable.
+# Transformers.js system prompt - dynamically loaded with full transformers.js documentation
+@functools.lru_cache(maxsize=1)
+def get_transformersjs_system_prompt() -> str:
+    """Get the complete transformers.js system prompt with full documentation"""
+    docs = _backend_docs()
+    return docs.build_transformersjs_system_prompt() if docs is not None else _FALLBACK_TRANSFORMERSJS
+
+
+STREAMLIT_SYSTEM_PROMPT = sys.intern("""You are an expert Streamlit developer. Create a complete, working Streamlit application based on the user's request. Generate all necessary code to make the application functional and runnable.
 
 ## Multi-File Application Structure
 
@@ -145,12 +161,6 @@ When creating Streamlit applications, you MUST organize your code into multiple
 - `pages/` - Additional pages for multi-page apps (optional)
 - Additional modules as needed (e.g., `data_processing.py`, `components.py`)
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-- NEVER generate README.md files under any circumstances
-- A template README.md is automatically provided and will be overridden by the deployment system
-- Generating a README.md will break the deployment process
-- Only generate the code files listed above
-
 **Output Format for Streamlit Apps:**
 You MUST use this exact format and ALWAYS include Dockerfile, streamlit_app.py, and requirements.txt:
 
@@ -187,16 +197,14 @@ Requirements:
 8. Make the UI intuitive and user-friendly
 9. Add helpful tooltips and documentation
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder
-"""
+""" + _README_WARNING + """
+- Only generate the code files listed above
 
+""" + _BUILT_WITH + """
+""")
 
-REACT_SYSTEM_PROMPT = """You are an expert React and Next.js developer creating a modern Next.js application.
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-|- NEVER generate README.md files under any circumstances
-|- A template README.md is automatically provided and will be overridden by the deployment system
-|- Generating a README.md will break the deployment process
+REACT_SYSTEM_PROMPT = sys.intern("""You are an expert React and Next.js developer creating a modern Next.js application.
 
 You will generate a Next.js project with TypeScript/JSX components. Follow this exact structure:
 
@@ -239,12 +247,17 @@ Output format (CRITICAL):
   (repeat for all files)
 - Do NOT wrap files in Markdown code fences or use === markers inside file content
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder
-"""
+**🚨 CRITICAL: DO NOT Generate README.md Files**
+|- NEVER generate README.md files under any circumstances
+|- A template README.md is automatically provided and will be overridden by the deployment system
+|- Generating a README.md will break the deployment process
+
+""" + _BUILT_WITH + """
+""")
 
 
 # React followup system prompt for modifying existing React/Next.js applications
-REACT_FOLLOW_UP_SYSTEM_PROMPT = """You are an expert React and Next.js developer modifying an existing Next.js application.
+_REACT_FOLLOW_UP_SKELETON = sys.intern("""You are an expert React and Next.js developer modifying an existing Next.js application.
 The user wants to apply changes based on their request.
 You MUST output ONLY the changes required using the following SEARCH/REPLACE block format. Do NOT output the entire file.
 Explain the changes briefly *before* the blocks if necessary, but the code changes THEMSELVES MUST be within the blocks.
@@ -289,6 +302,11 @@ When making changes to a Next.js application, identify which file needs modifica
 - Build errors → Fix next.config.js or package.json
 - Deployment issues → Fix Dockerfile
 
+""" + _BUILT_WITH + """
+""")
+
+# Worked SEARCH/REPLACE example, kept separate so the skeleton stays a stable cacheable prefix
+_REACT_FOLLOW_UP_EXAMPLE = sys.intern("""
 **Example Format:**
 ```
 Fixing the button styling in the header component...
@@ -309,19 +327,18 @@ Fixing the button styling in the header component...
   >
 >>>>>>> REPLACE
 ```
+""")
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder
-"""
+REACT_FOLLOW_UP_SYSTEM_PROMPT = sys.intern(_REACT_FOLLOW_UP_SKELETON + _REACT_FOLLOW_UP_EXAMPLE)
 
 
-# Gradio system prompt - dynamically loaded with full Gradio 6 documentation
-def get_gradio_system_prompt() -> str:
-    """Get the complete Gradio system prompt with full Gradio 6 documentation"""
-    if HAS_BACKEND_DOCS:
-        return build_gradio_system_prompt()
-    else:
-        # Fallback prompt if documentation manager is not available
-        return """You are an expert Gradio developer. Create a complete, working Gradio application based on the user's request. Generate all necessary code to make the application functional and runnable.
+def react_followup_prompt(include_example: bool = True) -> str:
+    """REACT_FOLLOW_UP_SYSTEM_PROMPT, optionally without the worked SEARCH/REPLACE example"""
+    return REACT_FOLLOW_UP_SYSTEM_PROMPT if include_example else _REACT_FOLLOW_UP_SKELETON
+
+
+# Fallback prompt if documentation manager is not available
+_FALLBACK_GRADIO = sys.intern("""You are an expert Gradio developer. Create a complete, working Gradio application based on the user's request. Generate all necessary code to make the application functional and runnable.
 
 ## Multi-File Application Structure
 
@@ -358,21 +375,20 @@ Requirements:
 7. Make the UI user-friendly with clear labels
 8. Include proper documentation in docstrings
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder
-"""
+""" + _BUILT_WITH + """
+""")
 
-# Legacy variable for backward compatibility - now dynamically generated
-GRADIO_SYSTEM_PROMPT = get_gradio_system_prompt()
 
+# Gradio system prompt - dynamically loaded with full Gradio 6 documentation
+@functools.lru_cache(maxsize=1)
+def get_gradio_system_prompt() -> str:
+    """Get the complete Gradio system prompt with full Gradio 6 documentation"""
+    docs = _backend_docs()
+    return docs.build_gradio_system_prompt() if docs is not None else _FALLBACK_GRADIO
 
-# ComfyUI system prompt - dynamically loaded with full ComfyUI documentation
-def get_comfyui_system_prompt() -> str:
-    """Get the complete ComfyUI system prompt with full ComfyUI documentation"""
-    if HAS_BACKEND_DOCS:
-        return build_comfyui_system_prompt()
-    else:
-        # Fallback prompt if documentation manager is not available
-        return """You are an expert ComfyUI developer. Generate clean, valid JSON workflows for ComfyUI based on the user's request.
+
+# Fallback prompt if documentation manager is not available
+_FALLBACK_COMFYUI = sys.intern("""You are an expert ComfyUI developer. Generate clean, valid JSON workflows for ComfyUI based on the user's request.
 
 🚨 CRITICAL: READ THE USER'S REQUEST CAREFULLY AND GENERATE A WORKFLOW THAT MATCHES THEIR SPECIFIC NEEDS.
 
@@ -445,100 +461,27 @@ ComfyUI workflows are JSON structures that define:
 - Do NOT add explanatory text before or after the JSON
 - The JSON should be complete and functional
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-- NEVER generate README.md files under any circumstances
-- A template README.md is automatically provided and will be overridden by the deployment system
-- Generating a README.md will break the deployment process
+""" + _README_WARNING + """
 
 IMPORTANT: Include "Built with anycoder - https://huggingface.co/spaces/akhaliq/anycoder" as a comment in the workflow metadata if possible.
-"""
-
-# Legacy variable - kept for backward compatibility but now just uses the static prompt
-# In production, use get_comfyui_system_prompt() which loads dynamic documentation
-JSON_SYSTEM_PROMPT = """You are an expert ComfyUI developer. Generate clean, valid JSON workflows for ComfyUI based on the user's request.
+""")
 
-🚨 CRITICAL: READ THE USER'S REQUEST CAREFULLY AND GENERATE A WORKFLOW THAT MATCHES THEIR SPECIFIC NEEDS.
 
-ComfyUI workflows are JSON structures that define:
-- Nodes: Individual processing units with specific functions (e.g., CheckpointLoaderSimple, CLIPTextEncode, KSampler, VAEDecode, SaveImage)
-- Connections: Links between nodes that define data flow
-- Parameters: Configuration values for each node (prompts, steps, cfg, sampler_name, etc.)
-- Inputs/Outputs: Data flow between nodes using numbered inputs/outputs
-
-**🚨 YOUR PRIMARY TASK:**
-1. **UNDERSTAND what the user is asking for** in their message
-2. **CREATE a ComfyUI workflow** that accomplishes their goal
-3. **GENERATE ONLY the JSON workflow** - no HTML, no applications, no explanations outside the JSON
-
-**JSON Syntax Rules:**
-- Use double quotes for strings
-- No trailing commas
-- Proper nesting and structure
-- Valid data types (string, number, boolean, null, object, array)
-
-**Example ComfyUI Workflow Structure:**
-```json
-{
-  "1": {
-    "inputs": {
-      "ckpt_name": "model.safetensors"
-    },
-    "class_type": "CheckpointLoaderSimple"
-  },
-  "2": {
-    "inputs": {
-      "text": "positive prompt here",
-      "clip": ["1", 1]
-    },
-    "class_type": "CLIPTextEncode"
-  },
-  "3": {
-    "inputs": {
-      "seed": 123456,
-      "steps": 20,
-      "cfg": 8.0,
-      "sampler_name": "euler",
-      "scheduler": "normal",
-      "denoise": 1.0,
-      "model": ["1", 0],
-      "positive": ["2", 0],
-      "negative": ["3", 0],
-      "latent_image": ["4", 0]
-    },
-    "class_type": "KSampler"
-  }
-}
-```
-
-**Common ComfyUI Nodes:**
-- CheckpointLoaderSimple - Load models
-- CLIPTextEncode - Encode prompts
-- KSampler - Generate latent images
-- VAEDecode - Decode latent to image
-- SaveImage - Save output
-- EmptyLatentImage - Create blank latent
-- LoadImage - Load input images
-- ControlNetLoader, ControlNetApply - ControlNet workflows
-- LoraLoader - Load LoRA models
-
-**Output Requirements:**
-- Generate ONLY the ComfyUI workflow JSON
-- The output should be pure, valid JSON that can be loaded directly into ComfyUI
-- Do NOT wrap in markdown code fences (no ```json```)
-- Do NOT add explanatory text before or after the JSON
-- The JSON should be complete and functional
+# ComfyUI system prompt - dynamically loaded with full ComfyUI documentation
+@functools.lru_cache(maxsize=1)
+def get_comfyui_system_prompt() -> str:
+    """Get the complete ComfyUI system prompt with full ComfyUI documentation"""
+    docs = _backend_docs()
+    return docs.build_comfyui_system_prompt() if docs is not None else _FALLBACK_COMFYUI
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-- NEVER generate README.md files under any circumstances
-- A template README.md is automatically provided and will be overridden by the deployment system
-- Generating a README.md will break the deployment process
 
-IMPORTANT: Include "Built with anycoder - https://huggingface.co/spaces/akhaliq/anycoder" as a comment in the workflow metadata if possible.
-"""
+# Legacy variable - kept for backward compatibility but now just uses the static fallback prompt
+# In production, use get_comfyui_system_prompt() which loads dynamic documentation
+JSON_SYSTEM_PROMPT = _FALLBACK_COMFYUI
 
 
 # Daggr system prompt - for building DAG-based AI workflows
-DAGGR_SYSTEM_PROMPT = """You are an expert Daggr developer. Create a complete, working Daggr workflow application based on the user's request. 
+DAGGR_SYSTEM_PROMPT = sys.intern("""You are an expert Daggr developer. Create a complete, working Daggr workflow application based on the user's request. 
 
 `daggr` is a Python library for building AI workflows that connect Gradio apps, ML models, and custom Python functions. It automatically generates a visual canvas for inspecting intermediate outputs and preserves state.
 
@@ -629,15 +572,187 @@ gradio>=6.0.2
 **🚨 CRITICAL: DO NOT Generate README.md Files**
 - NEVER generate README.md files under any circumstances
 - A template README.md is automatically provided and will be overridden by the deployment system
-"""
+""")
 
 
-GENERIC_SYSTEM_PROMPT = """You are an expert {language} developer. Write clean, idiomatic, and runnable {language} code for the user's request. If possible, include comments and best practices. Generate complete, working code that can be run immediately. If the user provides a file or other context, use it as a reference. If the code is for a script or app, make it as self-contained as possible.
+# Language-specific text goes last so every language shares the same prompt prefix
+_GENERIC_STATIC_PROMPT = sys.intern("""Write clean, idiomatic, and runnable code for the user's request. If possible, include comments and best practices. Generate complete, working code that can be run immediately. If the user provides a file or other context, use it as a reference. If the code is for a script or app, make it as self-contained as possible.
 
-**🚨 CRITICAL: DO NOT Generate README.md Files**
-- NEVER generate README.md files under any circumstances
-- A template README.md is automatically provided and will be overridden by the deployment system
-- Generating a README.md will break the deployment process
+""" + _README_WARNING + """
+
+""" + _BUILT_WITH)
 
-IMPORTANT: Always include "Built with anycoder" as clickable text in the header/top section of your application that links to https://huggingface.co/spaces/akhaliq/anycoder"""
+_GENERIC_LANGUAGE_PROMPT = sys.intern("""
+
+You are an expert {language} developer: write the code in {language}.""")
+
+GENERIC_SYSTEM_PROMPT = sys.intern(_GENERIC_STATIC_PROMPT + _GENERIC_LANGUAGE_PROMPT)
+
+
+@functools.lru_cache(maxsize=32)
+def generic_system_prompt(language: str) -> str:
+    """GENERIC_SYSTEM_PROMPT for one language; only the short language suffix is formatted"""
+    return _GENERIC_STATIC_PROMPT + _GENERIC_LANGUAGE_PROMPT.format(language=language)
+
+
+# Legacy variables for backward compatibility - built on first access (PEP 562)
+# rather than at import, then served from the getters' caches
+_LAZY_PROMPTS = {
+    "TRANSFORMERS_JS_SYSTEM_PROMPT": get_transformersjs_system_prompt,
+    "GRADIO_SYSTEM_PROMPT": get_gradio_system_prompt,
+    "COMFYUI_SYSTEM_PROMPT": get_comfyui_system_prompt,
+}
+
+# Mode (the language names used by the API) -> prompt getter; docs-backed getters are cached.
+# Languages without an entry use generic_system_prompt(language)
+PROMPTS: Dict[str, Callable[[], str]] = {
+    "html": lambda: HTML_SYSTEM_PROMPT,
+    "gradio": get_gradio_system_prompt,
+    "streamlit": lambda: STREAMLIT_SYSTEM_PROMPT,
+    "transformers.js": get_transformersjs_system_prompt,
+    "react": lambda: REACT_SYSTEM_PROMPT,
+    "react_followup": lambda: REACT_FOLLOW_UP_SYSTEM_PROMPT,
+    "comfyui": get_comfyui_system_prompt,
+    "daggr": lambda: DAGGR_SYSTEM_PROMPT,
+}
 
+__all__ = [
+    "PROMPTS",
+    "HTML_SYSTEM_PROMPT",
+    "TRANSFORMERS_JS_SYSTEM_PROMPT",
+    "STREAMLIT_SYSTEM_PROMPT",
+    "REACT_SYSTEM_PROMPT",
+    "REACT_FOLLOW_UP_SYSTEM_PROMPT",
+    "react_followup_prompt",
+    "GRADIO_SYSTEM_PROMPT",
+    "COMFYUI_SYSTEM_PROMPT",
+    "JSON_SYSTEM_PROMPT",
+    "DAGGR_SYSTEM_PROMPT",
+    "GENERIC_SYSTEM_PROMPT",
+    "generic_system_prompt",
+    "get_transformersjs_system_prompt",
+    "get_gradio_system_prompt",
+    "get_comfyui_system_prompt",
+    "as_anthropic_blocks",
+    "prompt_token_count",
+    "prompt_bytes",
+    "prompt_cache_key",
+    "CACHEABLE_PROMPTS",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_PROMPTS:
+        return _LAZY_PROMPTS[name]()
+    if name == "CACHEABLE_PROMPTS":
+        return _cacheable_prompts()
+    # e.g. HTML_SYSTEM_PROMPT_LEN: token count of HTML_SYSTEM_PROMPT, computed once
+    if name.endswith("_SYSTEM_PROMPT_LEN") and name[:-4] in __all__:
+        return prompt_token_count(name[:-4])
+    # e.g. HTML_SYSTEM_PROMPT_BYTES: UTF-8 encoding of HTML_SYSTEM_PROMPT, encoded once
+    if name.endswith("_SYSTEM_PROMPT_BYTES") and name[:-6] in __all__:
+        return prompt_bytes(name[:-6])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_PROMPTS) | {"CACHEABLE_PROMPTS"})
+
+
+def as_anthropic_blocks(prompt_name: str, language: Optional[str] = None) -> List[Dict]:
+    """Return a system prompt as Anthropic system content blocks with a prompt-cache breakpoint.
+
+    prompt_name is any prompt in this module (e.g. "GRADIO_SYSTEM_PROMPT"). The breakpoint
+    sits on the static part; for GENERIC_SYSTEM_PROMPT the per-request language sentence
+    (requires language) follows as a second, uncached block, and likewise the worked example
+    for REACT_FOLLOW_UP_SYSTEM_PROMPT.
+    """
+    if prompt_name == "GENERIC_SYSTEM_PROMPT":
+        if language is None:
+            raise ValueError("language is required for GENERIC_SYSTEM_PROMPT")
+        return [
+            {"type": "text", "text": _GENERIC_STATIC_PROMPT, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": _GENERIC_LANGUAGE_PROMPT.lstrip("\n").format(language=language)},
+        ]
+    if prompt_name == "REACT_FOLLOW_UP_SYSTEM_PROMPT":
+        # Breakpoint at the skeleton/example join, so swapping the example keeps the cache warm
+        return [
+            {"type": "text", "text": _REACT_FOLLOW_UP_SKELETON, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": _REACT_FOLLOW_UP_EXAMPLE.lstrip("\n")},
+        ]
+    return [{"type": "text", "text": _named_prompt(prompt_name), "cache_control": {"type": "ephemeral"}}]
+
+
+def _named_prompt(prompt_name: str) -> str:
+    """Look up a *_SYSTEM_PROMPT by name, building docs-backed prompts if needed"""
+    if not prompt_name.endswith("_SYSTEM_PROMPT") or prompt_name not in __all__:
+        raise ValueError(f"Unknown system prompt: {prompt_name}")
+    # Docs-backed prompts are lazy module attributes
+    return globals()[prompt_name] if prompt_name in globals() else __getattr__(prompt_name)
+
+
+# Rough characters-per-token ratio for English prompts when tiktoken isn't installed
+_CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoder():
+    """cl100k_base encoder if tiktoken is installed and usable, else None"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.debug("tiktoken unavailable (%s), estimating prompt token counts", e)
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_token_count(prompt_name: str) -> int:
+    """Token count of a named system prompt, tokenized once per process.
+
+    Exact (cl100k_base) with tiktoken, otherwise estimated from the character count.
+    """
+    prompt = _named_prompt(prompt_name)
+    encoder = _token_encoder()
+    if encoder is None:
+        return len(prompt) // _CHARS_PER_TOKEN
+    return len(encoder.encode(prompt))
+
+
+# Shortest prompt providers will cache (OpenAI, Claude Haiku; others need 2048-4096 tokens)
+_MIN_CACHEABLE_TOKENS = 1024
+
+
+@functools.lru_cache(maxsize=1)
+def _cacheable_prompts() -> frozenset:
+    """Names of the *_SYSTEM_PROMPTs long enough for provider prompt caching.
+
+    Audited once, on first access to CACHEABLE_PROMPTS; shorter prompts are logged at DEBUG.
+    """
+    cacheable = set()
+    for name in __all__:
+        if not name.endswith("_SYSTEM_PROMPT"):
+            continue
+        tokens = prompt_token_count(name)
+        if tokens >= _MIN_CACHEABLE_TOKENS:
+            cacheable.add(name)
+        else:
+            logger.debug("%s is ~%d tokens, below the %d-token prompt caching minimum",
+                         name, tokens, _MIN_CACHEABLE_TOKENS)
+    return frozenset(cacheable)
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_bytes(prompt_name: str) -> bytes:
+    """UTF-8 encoding of a named system prompt, for callers that write request bodies directly"""
+    return _named_prompt(prompt_name).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_cache_key(mode: str) -> str:
+    """Stable per-prompt key for providers that accept prompt_cache_key (e.g. OpenAI).
+
+    Derived from the prompt text, so it changes whenever the prompt does; hashed once per mode.
+    """
+    digest = hashlib.blake2b(PROMPTS[mode]().encode("utf-8"), digest_size=8).hexdigest()
+    return f"anycoder-{mode}-{digest}"
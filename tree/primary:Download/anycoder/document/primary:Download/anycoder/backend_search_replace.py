@@ -2,11 +2,79 @@
 Search/Replace utilities for applying targeted code changes.
 Search/Replace utilities for applying targeted code changes.
 """
+import functools
+import re
+import sys
+from typing import Tuple
 
 # Search/Replace block markers
-SEARCH_START = "\u003c\u003c\u003c\u003c\u003c\u003c\u003c SEARCH"
-DIVIDER = "======="
-REPLACE_END = "\u003e\u003e\u003e\u003e\u003e\u003e\u003e REPLACE"
+SEARCH_START = sys.intern("\u003c\u003c\u003c\u003c\u003c\u003c\u003c SEARCH")
+DIVIDER = sys.intern("=======")
+REPLACE_END = sys.intern("\u003e\u003e\u003e\u003e\u003e\u003e\u003e REPLACE")
+
+# One search/replace block: marker lines may carry surrounding whitespace. A block ends at
+# its REPLACE marker, at the next SEARCH marker or at the end of the text, and may lack the
+# ======= divider (empty replacement)
+_SEARCH_LINE = r"^[^\S\n]*" + re.escape(SEARCH_START) + r"[^\S\n]*$"
+_BLOCK_RE = re.compile(
+    _SEARCH_LINE + r"(?P<search>.*?)"
+    r"(?:^[^\S\n]*" + re.escape(DIVIDER) + r"[^\S\n]*$(?P<replace>.*?))?"
+    r"(?:^[^\S\n]*" + re.escape(REPLACE_END) + r"[^\S\n]*$|(?=" + _SEARCH_LINE + r")|\Z)",
+    re.MULTILINE | re.DOTALL,
+)
+_DIVIDER_LINE_RE = re.compile(r"^[^\S\n]*" + re.escape(DIVIDER) + r"[^\S\n]*(?:\n|\Z)", re.MULTILINE)
+
+# CSS-rule fallback: a conservative matcher for `selector { ... }` blocks
+_CSS_BLOCK_RE = re.compile(r"([^{]+)\{([\s\S]*?)\}", re.MULTILINE)
+
+# Indentation of the first non-blank line
+_INDENT_RE = re.compile(r"^([ \t]*)\S", re.MULTILINE)
+
+# parse_file_specific_changes: file sections like === filename ===
+_FILE_SECTION_RE = re.compile(r"^===\s+([^\n=]+?)\s+===\s*$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _selector_rule_re(selector: str):
+    """Regex for an existing `selector { ... }` rule, capturing the opening `{`, body and closing `}`"""
+    return re.compile(rf"({re.escape(selector)}\s*\{{)([\s\S]*?)(\}})")
+
+
+def _apply_css_fallback(content: str, css_text: str) -> Tuple[str, bool]:
+    """Replace the bodies of existing CSS rules with the `selector { ... }` blocks in css_text.
+    
+    Returns:
+        The updated content and whether any rule was replaced
+    """
+    # Text without braces cannot hold a rule, so skip the regex scan
+    if '{' not in css_text or '}' not in css_text:
+        return content, False
+    
+    updated_content = content
+    replaced_any_rule = False
+    for selector_raw, body_raw in _CSS_BLOCK_RE.findall(css_text):
+        selector = selector_raw.strip()
+        if not selector:
+            continue
+        body = body_raw.strip()
+        body_lines = body.splitlines()
+        
+        def _replace_rule(match):
+            prefix, existing_body, suffix = match.groups()
+            # Preserve indentation of the existing first body line if present
+            indent_match = _INDENT_RE.search(existing_body)
+            first_line_indent = indent_match.group(1) if indent_match else ""
+            # Re-indent provided body with the detected indent
+            if body:
+                new_body_lines = [first_line_indent + line if line.strip() else line for line in body_lines]
+                new_body_text = "\n" + "\n".join(new_body_lines) + "\n"
+            else:
+                new_body_text = existing_body  # If empty body provided, keep existing
+            return f"{prefix}{new_body_text}{suffix}"
+        
+        updated_content, num_subs = _selector_rule_re(selector).subn(_replace_rule, updated_content, count=1)
+        replaced_any_rule = replaced_any_rule or num_subs > 0
+    return updated_content, replaced_any_rule
 
 
 def apply_search_replace_changes(original_content: str, changes_text: str) -> str:
@@ -19,142 +87,50 @@ def apply_search_replace_changes(original_content: str, changes_text: str) -> st
     Returns:
         Modified content with all search/replace blocks applied
     """
-    if not changes_text.strip():
+    if not changes_text or changes_text.isspace():
         return original_content
     
-    # If the model didn't use the block markers, try a CSS-rule fallback where
-    # provided blocks like `.selector { ... }` replace matching CSS rules.
-    if (SEARCH_START not in changes_text) and (DIVIDER not in changes_text) and (REPLACE_END not in changes_text):
-        try:
-            import re  # Local import to avoid global side effects
-            updated_content = original_content
-            replaced_any_rule = False
-            # Find CSS-like rule blocks in the changes_text
-            # This is a conservative matcher that looks for `selector { ... }`
-            css_blocks = re.findall(r"([^{]+)\{([\s\S]*?)\}", changes_text, flags=re.MULTILINE)
-            for selector_raw, body_raw in css_blocks:
-                selector = selector_raw.strip()
-                body = body_raw.strip()
-                if not selector:
-                    continue
-                # Build a regex to find the existing rule for this selector
-                # Capture opening `{` and closing `}` to preserve them; replace inner body.
-                pattern = re.compile(rf"({re.escape(selector)}\s*\{{)([\s\S]*?)(\}})")
-                def _replace_rule(match):
-                    nonlocal replaced_any_rule
-                    replaced_any_rule = True
-                    prefix, existing_body, suffix = match.groups()
-                    # Preserve indentation of the existing first body line if present
-                    first_line_indent = ""
-                    for line in existing_body.splitlines():
-                        stripped = line.lstrip(" \t")
-                        if stripped:
-                            first_line_indent = line[: len(line) - len(stripped)]
-                            break
-                    # Re-indent provided body with the detected indent
-                    if body:
-                        new_body_lines = [first_line_indent + line if line.strip() else line for line in body.splitlines()]
-                        new_body_text = "\n" + "\n".join(new_body_lines) + "\n"
-                    else:
-                        new_body_text = existing_body  # If empty body provided, keep existing
-                    return f"{prefix}{new_body_text}{suffix}"
-                updated_content, num_subs = pattern.subn(_replace_rule, updated_content, count=1)
-            if replaced_any_rule:
-                return updated_content
-        except Exception:
-            # Fallback silently to the standard block-based application
-            pass
-
-    # Split the changes text into individual search/replace blocks
-    blocks = []
-    current_block = ""
-    lines = changes_text.split('\n')
-    
-    for line in lines:
-        if line.strip() == SEARCH_START:
-            if current_block.strip():
-                blocks.append(current_block.strip())
-            current_block = line + '\n'
-        elif line.strip() == REPLACE_END:
-            current_block += line + '\n'
-            blocks.append(current_block.strip())
-            current_block = ""
-        else:
-            current_block += line + '\n'
-    
-    if current_block.strip():
-        blocks.append(current_block.strip())
-    
+    # Without a SEARCH marker no block can match, so the scan below is skipped
+    has_start = SEARCH_START in changes_text
+    if not has_start:
+        # If the model didn't use the block markers, try a CSS-rule fallback where
+        # provided blocks like `.selector { ... }` replace matching CSS rules.
+        if (DIVIDER not in changes_text) and (REPLACE_END not in changes_text):
+            try:
+                updated_content, replaced_any_rule = _apply_css_fallback(original_content, changes_text)
+                if replaced_any_rule:
+                    return updated_content
+            except Exception:
+                # Fallback silently to the standard block-based application
+                pass
+        return original_content
+
     modified_content = original_content
     
-    for block in blocks:
-        if not block.strip():
+    for block in _BLOCK_RE.finditer(changes_text):
+        search_text = block.group('search').strip()
+        if not search_text:
             continue
-            
-        # Parse the search/replace block
-        lines = block.split('\n')
-        search_lines = []
-        replace_lines = []
-        in_search = False
-        in_replace = False
+        replace_text = block.group('replace') or ''
+        # Extra ======= lines inside the replacement are dropped, not kept as text
+        if DIVIDER in replace_text:
+            replace_text = _DIVIDER_LINE_RE.sub('', replace_text)
+        replace_text = replace_text.strip()
         
-        for line in lines:
-            if line.strip() == SEARCH_START:
-                in_search = True
-                in_replace = False
-            elif line.strip() == DIVIDER:
-                in_search = False
-                in_replace = True
-            elif line.strip() == REPLACE_END:
-                in_replace = False
-            elif in_search:
-                search_lines.append(line)
-            elif in_replace:
-                replace_lines.append(line)
-        
-        # Apply the search/replace
-        if search_lines:
-            search_text = '\n'.join(search_lines).strip()
-            replace_text = '\n'.join(replace_lines).strip()
-            
-            if search_text in modified_content:
-                modified_content = modified_content.replace(search_text, replace_text)
-            else:
-                # If exact block match fails, attempt a CSS-rule fallback using the replace_text
-                try:
-                    import re
-                    updated_content = modified_content
-                    replaced_any_rule = False
-                    css_blocks = re.findall(r"([^{]+)\{([\s\S]*?)\}", replace_text, flags=re.MULTILINE)
-                    for selector_raw, body_raw in css_blocks:
-                        selector = selector_raw.strip()
-                        body = body_raw.strip()
-                        if not selector:
-                            continue
-                        pattern = re.compile(rf"({re.escape(selector)}\s*\{{)([\s\S]*?)(\}})")
-                        def _replace_rule(match):
-                            nonlocal replaced_any_rule
-                            replaced_any_rule = True
-                            prefix, existing_body, suffix = match.groups()
-                            first_line_indent = ""
-                            for line in existing_body.splitlines():
-                                stripped = line.lstrip(" \t")
-                                if stripped:
-                                    first_line_indent = line[: len(line) - len(stripped)]
-                                    break
-                            if body:
-                                new_body_lines = [first_line_indent + line if line.strip() else line for line in body.splitlines()]
-                                new_body_text = "\n" + "\n".join(new_body_lines) + "\n"
-                            else:
-                                new_body_text = existing_body
-                            return f"{prefix}{new_body_text}{suffix}"
-                        updated_content, num_subs = pattern.subn(_replace_rule, updated_content, count=1)
-                    if replaced_any_rule:
-                        modified_content = updated_content
-                    else:
-                        print(f"[Search/Replace] Warning: Search text not found in content: {search_text[:100]}...")
-                except Exception:
+        # Apply the search/replace (split finds every occurrence in one scan)
+        parts = modified_content.split(search_text)
+        if len(parts) > 1:
+            modified_content = replace_text.join(parts)
+        else:
+            # If exact block match fails, attempt a CSS-rule fallback using the replace_text
+            try:
+                updated_content, replaced_any_rule = _apply_css_fallback(modified_content, replace_text)
+                if replaced_any_rule:
+                    modified_content = updated_content
+                else:
                     print(f"[Search/Replace] Warning: Search text not found in content: {search_text[:100]}...")
+            except Exception:
+                print(f"[Search/Replace] Warning: Search text not found in content: {search_text[:100]}...")
     
     return modified_content
 
@@ -168,7 +144,14 @@ def has_search_replace_blocks(text: str) -> bool:
     Returns:
         True if text contains search/replace markers, False otherwise
     """
-    return (SEARCH_START in text) and (DIVIDER in text) and (REPLACE_END in text)
+    # One forward scan: each marker is only searched for after the previous one
+    start = text.find(SEARCH_START)
+    if start < 0:
+        return False
+    divider = text.find(DIVIDER, start + len(SEARCH_START))
+    if divider < 0:
+        return False
+    return text.find(REPLACE_END, divider + len(DIVIDER)) >= 0
 
 
 def parse_file_specific_changes(changes_text: str) -> dict:
@@ -182,33 +165,23 @@ def parse_file_specific_changes(changes_text: str) -> dict:
     Returns:
         Dict mapping filename -> search/replace changes for that file
     """
-    import re
-    
     file_changes = {}
     
-    # Pattern to match file sections: === filename ===
-    file_pattern = re.compile(r"^===\s+([^\n=]+?)\s+===\s*$", re.MULTILINE)
+    # Each section runs from the end of its header to the start of the next one
+    prev = None
+    for match in _FILE_SECTION_RE.finditer(changes_text):
+        if prev is not None:
+            file_content = changes_text[prev.end():match.start()].strip()
+            if file_content:
+                file_changes[sys.intern(prev.group(1).strip())] = file_content
+        prev = match
     
-    # Find all file sections
-    matches = list(file_pattern.finditer(changes_text))
-    
-    if not matches:
+    if prev is None:
         # No file-specific sections, treat entire text as changes
         return {"__all__": changes_text}
     
-    for i, match in enumerate(matches):
-        filename = match.group(1).strip()
-        start_pos = match.end()
-        
-        # Find the end of this file's section (start of next file or end of text)
-        if i + 1 < len(matches):
-            end_pos = matches[i + 1].start()
-        else:
-            end_pos = len(changes_text)
-        
-        file_content = changes_text[start_pos:end_pos].strip()
-        
-        if file_content:
-            file_changes[filename] = file_content
+    file_content = changes_text[prev.end():].strip()
+    if file_content:
+        file_changes[sys.intern(prev.group(1).strip())] = file_content
     
     return file_changes
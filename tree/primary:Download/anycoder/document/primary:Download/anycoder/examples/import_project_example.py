@@ -7,71 +7,70 @@ to fetch code from various sources without Gradio.
 
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from project_importer import ProjectImporter
 
+# Examples run concurrently; each one prints its report while holding this lock
+_print_lock = threading.Lock()
 
-def example_import_space():
+
+def example_import_space(importer: ProjectImporter):
     """Example: Import a HuggingFace Space"""
-    print("=" * 80)
-    print("Example 1: Importing a HuggingFace Space")
-    print("=" * 80)
-    
-    importer = ProjectImporter()
     result = importer.import_space("akhaliq", "anycoder")
     
-    print(f"Status: {result['status']}")
-    print(f"Message: {result['message']}")
-    print(f"Language: {result['language']}")
-    print(f"Files: {len(result['metadata'].get('files', []))}")
-    print(f"\nFirst 500 characters of code:\n{result['code'][:500]}...")
-    print()
+    with _print_lock:
+        print("=" * 80)
+        print("Example 1: Importing a HuggingFace Space")
+        print("=" * 80)
+        
+        print(f"Status: {result['status']}")
+        print(f"Message: {result['message']}")
+        print(f"Language: {result['language']}")
+        print(f"Files: {len(result['metadata'].get('files', []))}")
+        print(f"\nFirst 500 characters of code:\n{result['code'][:500]}...")
+        print()
 
 
-def example_import_model():
+def example_import_model(importer: ProjectImporter):
     """Example: Import a HuggingFace Model"""
-    print("=" * 80)
-    print("Example 2: Importing a HuggingFace Model")
-    print("=" * 80)
-    
-    importer = ProjectImporter()
     result = importer.import_model("meta-llama/Llama-3.2-1B-Instruct")
     
-    print(f"Status: {result['status']}")
-    print(f"Message: {result['message']}")
-    print(f"Language: {result['language']}")
-    print(f"Pipeline Tag: {result['metadata'].get('pipeline_tag')}")
-    print(f"\nCode:\n{result['code']}")
-    print()
+    with _print_lock:
+        print("=" * 80)
+        print("Example 2: Importing a HuggingFace Model")
+        print("=" * 80)
+        
+        print(f"Status: {result['status']}")
+        print(f"Message: {result['message']}")
+        print(f"Language: {result['language']}")
+        print(f"Pipeline Tag: {result['metadata'].get('pipeline_tag')}")
+        print(f"\nCode:\n{result['code']}")
+        print()
 
 
-def example_import_github():
+def example_import_github(importer: ProjectImporter):
     """Example: Import a GitHub Repository"""
-    print("=" * 80)
-    print("Example 3: Importing from GitHub")
-    print("=" * 80)
-    
-    importer = ProjectImporter()
     result = importer.import_github_repo("huggingface", "transformers")
     
-    print(f"Status: {result['status']}")
-    print(f"Message: {result['message']}")
-    print(f"Language: {result['language']}")
-    print(f"\nFirst 500 characters of code:\n{result['code'][:500]}...")
-    print()
+    with _print_lock:
+        print("=" * 80)
+        print("Example 3: Importing from GitHub")
+        print("=" * 80)
+        
+        print(f"Status: {result['status']}")
+        print(f"Message: {result['message']}")
+        print(f"Language: {result['language']}")
+        print(f"\nFirst 500 characters of code:\n{result['code'][:500]}...")
+        print()
 
 
-def example_import_from_url():
+def example_import_from_url(importer: ProjectImporter):
     """Example: Import from any URL"""
-    print("=" * 80)
-    print("Example 4: Import from URL (automatic detection)")
-    print("=" * 80)
-    
-    importer = ProjectImporter()
-    
     # Test different URL types
     urls = [
         "https://huggingface.co/spaces/akhaliq/anycoder",
@@ -79,21 +78,28 @@ def example_import_from_url():
         "https://github.com/huggingface/diffusers"
     ]
     
-    for url in urls:
-        print(f"\nImporting: {url}")
-        result = importer.import_from_url(url)
-        print(f"  Status: {result['status']}")
-        print(f"  Language: {result['language']}")
-        print(f"  Message: {result['message']}")
+    # The imports are network-bound, so fetch all URLs at once
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        results = list(executor.map(importer.import_from_url, urls))
+    
+    with _print_lock:
+        print("=" * 80)
+        print("Example 4: Import from URL (automatic detection)")
+        print("=" * 80)
+        
+        for url, result in zip(urls, results):
+            print(f"\nImporting: {url}")
+            print(f"  Status: {result['status']}")
+            print(f"  Language: {result['language']}")
+            print(f"  Message: {result['message']}")
 
 
-def example_save_to_file():
+def example_save_to_file(importer: ProjectImporter):
     """Example: Save imported code to a file"""
     print("=" * 80)
     print("Example 5: Save imported code to file")
     print("=" * 80)
     
-    importer = ProjectImporter()
     result = importer.import_model("stabilityai/stable-diffusion-3.5-large")
     
     if result['status'] == 'success':
@@ -106,57 +112,54 @@ def example_save_to_file():
     print()
 
 
-def example_with_metadata():
+def example_with_metadata(importer: ProjectImporter):
     """Example: Working with metadata"""
-    print("=" * 80)
-    print("Example 6: Working with metadata")
-    print("=" * 80)
-    
-    importer = ProjectImporter()
-    result = importer.import_model("Qwen/Qwen2.5-Coder-32B-Instruct")
-    
-    print(f"Status: {result['status']}")
-    print(f"Message: {result['message']}")
-    print(f"\nMetadata:")
-    for key, value in result['metadata'].items():
-        print(f"  {key}: {value}")
-    
-    # Check if there are alternatives
-    if result['metadata'].get('has_alternatives'):
-        print("\n✨ This model has multiple code options available!")
-        print("  - Inference code (serverless)")
-        print("  - Local code (transformers/diffusers)")
-    print()
+    # Preferring local code makes the importer fetch the README, so both code options are reported
+    result = importer.import_model("Qwen/Qwen2.5-Coder-32B-Instruct", prefer_local=True)
+    
+    with _print_lock:
+        print("=" * 80)
+        print("Example 6: Working with metadata")
+        print("=" * 80)
+        
+        print(f"Status: {result['status']}")
+        print(f"Message: {result['message']}")
+        print(f"\nMetadata:")
+        for key, value in result['metadata'].items():
+            print(f"  {key}: {value}")
+        
+        # Check if there are alternatives
+        if result['metadata'].get('has_alternatives'):
+            print("\n✨ This model has multiple code options available!")
+            print("  - Inference code (serverless)")
+            print("  - Local code (transformers/diffusers)")
+        print()
 
 
 def main():
     """Run all examples"""
     print("\n🚀 ProjectImporter Examples\n")
     
-    try:
-        example_import_space()
-    except Exception as e:
-        print(f"❌ Space import failed: {e}\n")
-    
-    try:
-        example_import_model()
-    except Exception as e:
-        print(f"❌ Model import failed: {e}\n")
+    examples = {
+        example_import_space: "Space import",
+        example_import_model: "Model import",
+        example_import_github: "GitHub import",
+        example_import_from_url: "URL import",
+        example_with_metadata: "Metadata example",
+    }
     
-    try:
-        example_import_github()
-    except Exception as e:
-        print(f"❌ GitHub import failed: {e}\n")
-    
-    try:
-        example_import_from_url()
-    except Exception as e:
-        print(f"❌ URL import failed: {e}\n")
+    # One importer shared by every example, so its HTTP connections are reused
+    importer = ProjectImporter()
     
-    try:
-        example_with_metadata()
-    except Exception as e:
-        print(f"❌ Metadata example failed: {e}\n")
+    # The examples are I/O-bound, so run them concurrently and report as they finish
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(example, importer): label for example, label in examples.items()}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                with _print_lock:
+                    print(f"❌ {futures[future]} failed: {e}\n")
     
     print("\n✅ Examples completed!")
 
@@ -9,12 +9,163 @@ This module provides functionality to import projects from:
 No Gradio dependency required - pure Python implementation.
 """
 
+import asyncio
+import functools
+import io
+import itertools
 import os
 import re
-import requests
-from typing import Dict, List, Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
-from huggingface_hub import HfApi, list_repo_files
+
+# google-re2 matches in linear time, so READMEs full of unclosed fences cannot make the
+# code-block scan quadratic; both patterns below port as-is (no backreferences or lookarounds)
+try:
+    import re2 as _pattern_re
+except ImportError:
+    _pattern_re = re
+
+# httpx and huggingface_hub are imported where they are first used, so that
+# importing this module (and GitHub-only CLI runs) stays cheap
+
+# Shared worker pool for overlapping independent network fetches
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="importer")
+
+# (source, repo, token) -> (fetched_at, README text); READMEs rarely change within a session,
+# so repeated imports of the same repo skip the download. Failed fetches are not cached.
+_README_CACHE: Dict[Tuple[str, str, Optional[str]], Tuple[float, str]] = {}
+_README_CACHE_MAX_ENTRIES = 128
+_README_TTL_SECONDS = 600
+
+
+def _readme_cached(key: Tuple[str, str, Optional[str]], fetch: Callable[[], Optional[str]]) -> Optional[str]:
+    """Return a README fetched within the last _README_TTL_SECONDS, otherwise fetch and remember it"""
+    now = time.monotonic()
+    cached = _README_CACHE.get(key)
+    if cached and now - cached[0] < _README_TTL_SECONDS:
+        return cached[1]
+    text = fetch()
+    if text:
+        _README_CACHE.pop(key, None)
+        _README_CACHE[key] = (now, text)
+        # Evict the oldest entries (dicts keep insertion order)
+        while len(_README_CACHE) > _README_CACHE_MAX_ENTRIES:
+            _README_CACHE.pop(next(iter(_README_CACHE)), None)
+    return text
+
+
+# Extensions of space files pulled into a multi-file import
+_INCLUDE_EXTS = (
+    '.py', '.js', '.html', '.css', '.json', '.txt', '.yml', '.yaml',
+    '.toml', '.cfg', '.ini', '.sh', '.md'
+)
+
+# Fenced markdown code blocks: optional language tag, then the code
+_CODE_BLOCK_RE = _pattern_re.compile(r"(?i)```([\w+-]+)?\s*\n([\s\S]*?)```")
+
+# Keywords that make a README code block worth importing, and ones that raise its score
+_RELEVANT_CODE_RE = _pattern_re.compile("|".join(map(re.escape, ["transformers", "diffusers", "pipeline(", "gradio", "import"])))
+_CODE_SCORE_KEYWORDS = (
+    "from transformers", "import transformers", "pipeline(",
+    "AutoModel", "AutoTokenizer", "text-generation",
+    "from diffusers", "import diffusers", "DiffusionPipeline",
+    "StableDiffusion", "from gradio", "import gradio"
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_source_url(url: str) -> Tuple[str, Optional[Tuple[Tuple[str, str], ...]]]:
+    """Parse URL and detect source type; metadata is returned as hashable (key, value) pairs"""
+    try:
+        parsed = urlparse(url.strip())
+        netloc = (parsed.netloc or "").lower()
+        path = (parsed.path or "").strip("/")
+        
+        # HuggingFace Spaces
+        if ("huggingface.co" in netloc or "hf.co" in netloc) and path.startswith("spaces/"):
+            parts = path.split("/")
+            if len(parts) >= 3:
+                return "hf_space", (("username", parts[1]), ("project", parts[2]))
+        
+        # HuggingFace Model
+        if ("huggingface.co" in netloc or "hf.co" in netloc) and not path.startswith(("spaces/", "datasets/")):
+            parts = path.split("/")
+            if len(parts) >= 2:
+                return "hf_model", (("repo_id", f"{parts[0]}/{parts[1]}"),)
+        
+        # GitHub Repository
+        if "github.com" in netloc:
+            parts = path.split("/")
+            if len(parts) >= 2:
+                return "github", (("owner", parts[0]), ("repo", parts[1]))
+    
+    except Exception:
+        pass
+    
+    return "unknown", None
+
+
+# Inference provider snippets by pipeline tag; {model_id} is filled in with str.format
+_INFERENCE_TEMPLATES = {
+    "text-generation": '''import os
+from huggingface_hub import InferenceClient
+
+client = InferenceClient(api_key=os.environ["HF_TOKEN"])
+
+completion = client.chat.completions.create(
+    model="{model_id}",
+    messages=[
+        {{"role": "user", "content": "What is the capital of France?"}}
+    ],
+)
+
+print(completion.choices[0].message)''',
+    
+    "text-to-image": '''import os
+from huggingface_hub import InferenceClient
+
+client = InferenceClient(api_key=os.environ["HF_TOKEN"])
+
+# output is a PIL.Image object
+image = client.text_to_image(
+    "Astronaut riding a horse",
+    model="{model_id}",
+)
+
+# Save the image
+image.save("output.png")''',
+    
+    "automatic-speech-recognition": '''import os
+from huggingface_hub import InferenceClient
+
+client = InferenceClient(api_key=os.environ["HF_TOKEN"])
+
+with open("audio.mp3", "rb") as f:
+    audio_data = f.read()
+
+result = client.automatic_speech_recognition(
+    audio_data,
+    model="{model_id}",
+)
+
+print(result)''',
+    
+    "text-to-speech": '''import os
+from huggingface_hub import InferenceClient
+
+client = InferenceClient(api_key=os.environ["HF_TOKEN"])
+
+audio = client.text_to_speech(
+    "Hello world",
+    model="{model_id}",
+)
+
+# Save the audio
+with open("output.mp3", "wb") as f:
+    f.write(audio)''',
+}
 
 
 class ProjectImporter:
@@ -28,14 +179,55 @@ class ProjectImporter:
             hf_token: Optional HuggingFace token for authenticated requests
         """
         self.hf_token = hf_token or os.environ.get("HF_TOKEN")
-        self.api = HfApi(token=self.hf_token)
+        
+        # Space file listings by space id, shared by the transformers.js check and the file
+        # fetch of one import_space call (dropped when that call returns)
+        self._space_files: Dict[str, List[str]] = {}
+    
+    def close(self):
+        """Close the pooled HTTP client, if one was created"""
+        http = self.__dict__.pop("_http", None)
+        if http is not None:
+            http.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @functools.cached_property
+    def api(self):
+        """HuggingFace Hub client, created on first use"""
+        from huggingface_hub import HfApi
+        return HfApi(token=self.hf_token)
+    
+    @functools.cached_property
+    def _http(self):
+        """Pooled keep-alive HTTP client for raw GitHub and Hub fetches, created on first use"""
+        import httpx
+        
+        # HTTP/2 multiplexes the concurrent file fetches over one connection per host
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        
+        transport = httpx.HTTPTransport(
+            http2=http2,
+            retries=2,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+        return httpx.Client(transport=transport, timeout=15.0, follow_redirects=True)
     
-    def import_from_url(self, url: str) -> Dict[str, any]:
+    def import_from_url(self, url: str, prefer_local: bool = False) -> Dict[str, any]:
         """
         Import a project from any supported URL.
         
         Args:
             url: URL to import from (HF Space, HF Model, or GitHub)
+            prefer_local: For models, prefer local inference code over serverless
         
         Returns:
             Dictionary containing:
@@ -61,7 +253,7 @@ class ProjectImporter:
         if kind == "hf_space":
             return self.import_space(meta["username"], meta["project"])
         elif kind == "hf_model":
-            return self.import_model(meta["repo_id"])
+            return self.import_model(meta["repo_id"], prefer_local=prefer_local)
         elif kind == "github":
             return self.import_github_repo(meta["owner"], meta["repo"])
         else:
@@ -74,6 +266,23 @@ class ProjectImporter:
                 "metadata": {}
             }
     
+    def import_many(self, urls: List[str], max_workers: int = 16, prefer_local: bool = False) -> List[Dict[str, any]]:
+        """
+        Import several projects concurrently, sharing this importer's HTTP client and caches.
+        
+        Args:
+            urls: URLs to import from (HF Spaces, HF Models, or GitHub)
+            max_workers: Maximum number of imports running at once
+            prefer_local: For models, prefer local inference code over serverless
+        
+        Returns:
+            One result dictionary per URL, in the same order as urls
+        """
+        # A dedicated pool: imports block on fetches queued to _FETCH_EXECUTOR, so running
+        # them on that same pool could exhaust it and deadlock
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-many") as executor:
+            return list(executor.map(lambda url: self.import_from_url(url, prefer_local), urls))
+    
     def import_space(self, username: str, project_name: str) -> Dict[str, any]:
         """
         Import a HuggingFace Space.
@@ -158,6 +367,10 @@ class ProjectImporter:
                 "url": f"https://huggingface.co/spaces/{username}/{project_name}",
                 "metadata": {}
             }
+        
+        finally:
+            # The listing is only shared within this import; a later import must see new files
+            self._space_files.pop(f"{username}/{project_name}", None)
     
     def import_model(self, model_id: str, prefer_local: bool = False) -> Dict[str, any]:
         """
@@ -186,10 +399,20 @@ class ProjectImporter:
                 any("transformers.js" in str(tag).lower() for tag in tags)
             )
             
+            # Try to get inference provider code
+            inference_code = self._generate_inference_code(model_id, pipeline_tag)
+            
+            # Fetch the README once, and only when it can change the result: ONNX models,
+            # local code preferred, or no inference template. model_info already lists the
+            # repo files, so also skip the request when there is no README
+            siblings = getattr(model_info, "siblings", None)
+            has_readme = siblings is None or any(s.rfilename == "README.md" for s in siblings)
+            needs_readme = is_onnx_model or prefer_local or not inference_code
+            readme = self._fetch_hf_model_readme(model_id) if has_readme and needs_readme else None
+            
             # For ONNX models, try to extract Transformers.js code from README first
             if is_onnx_model:
                 try:
-                    readme = self._fetch_hf_model_readme(model_id)
                     if readme:
                         transformersjs_code = self._extract_transformersjs_code(readme, model_id)
                         if transformersjs_code:
@@ -209,13 +432,9 @@ class ProjectImporter:
                 except Exception as e:
                     print(f"Failed to extract Transformers.js code: {e}")
             
-            # Try to get inference provider code
-            inference_code = self._generate_inference_code(model_id, pipeline_tag)
-            
             # Try to get transformers/diffusers code from README
             readme_code = None
             try:
-                readme = self._fetch_hf_model_readme(model_id)
                 if readme:
                     _, readme_code = self._extract_code_from_markdown(readme)
             except:
@@ -342,46 +561,37 @@ class ProjectImporter:
                 "metadata": {}
             }
     
+    # ==================== Async API ====================
+    # The imports block on network I/O; these run them in a worker thread so async callers
+    # (e.g. FastAPI endpoints) keep serving other requests and can gather many imports at once
+    
+    async def aimport_from_url(self, url: str, prefer_local: bool = False) -> Dict[str, any]:
+        """Async variant of import_from_url"""
+        return await asyncio.to_thread(self.import_from_url, url, prefer_local)
+    
+    async def aimport_space(self, username: str, project_name: str) -> Dict[str, any]:
+        """Async variant of import_space"""
+        return await asyncio.to_thread(self.import_space, username, project_name)
+    
+    async def aimport_model(self, model_id: str, prefer_local: bool = False) -> Dict[str, any]:
+        """Async variant of import_model"""
+        return await asyncio.to_thread(self.import_model, model_id, prefer_local)
+    
+    async def aimport_github_repo(self, owner: str, repo: str) -> Dict[str, any]:
+        """Async variant of import_github_repo"""
+        return await asyncio.to_thread(self.import_github_repo, owner, repo)
+    
     # ==================== Private Helper Methods ====================
     
     def _parse_url(self, url: str) -> Tuple[str, Optional[Dict]]:
         """Parse URL and detect source type"""
-        try:
-            parsed = urlparse(url.strip())
-            netloc = (parsed.netloc or "").lower()
-            path = (parsed.path or "").strip("/")
-            
-            # HuggingFace Spaces
-            if ("huggingface.co" in netloc or "hf.co" in netloc) and path.startswith("spaces/"):
-                parts = path.split("/")
-                if len(parts) >= 3:
-                    return "hf_space", {"username": parts[1], "project": parts[2]}
-            
-            # HuggingFace Model
-            if ("huggingface.co" in netloc or "hf.co" in netloc) and not path.startswith(("spaces/", "datasets/")):
-                parts = path.split("/")
-                if len(parts) >= 2:
-                    return "hf_model", {"repo_id": f"{parts[0]}/{parts[1]}"}
-            
-            # GitHub Repository
-            if "github.com" in netloc:
-                parts = path.split("/")
-                if len(parts) >= 2:
-                    return "github", {"owner": parts[0], "repo": parts[1]}
-        
-        except Exception:
-            pass
-        
-        return "unknown", None
+        kind, meta = _parse_source_url(url)
+        return kind, dict(meta) if meta is not None else None
     
     def _is_transformers_js_space(self, username: str, project_name: str) -> bool:
         """Check if space is a transformers.js app"""
         try:
-            files = list_repo_files(
-                repo_id=f"{username}/{project_name}",
-                repo_type="space",
-                token=self.hf_token
-            )
+            files = self._list_space_files(f"{username}/{project_name}")
             
             has_html = any('index.html' in f for f in files)
             has_js = any('index.js' in f for f in files)
@@ -391,22 +601,34 @@ class ProjectImporter:
         except:
             return False
     
+    def _list_space_files(self, space_id: str) -> List[str]:
+        """List every file path in a space, paging the tree endpoint at its maximum page size"""
+        cached = self._space_files.get(space_id)
+        if cached is not None:
+            return cached
+        
+        headers = {"Authorization": f"Bearer {self.hf_token}"} if self.hf_token else {}
+        url = f"{self.api.endpoint}/api/spaces/{space_id}/tree/main"
+        params = {"recursive": "true", "limit": 1000}
+        files = []
+        while url:
+            resp = self._http.get(url, params=params, headers=headers)
+            resp.raise_for_status()
+            files.extend(entry["path"] for entry in resp.json() if entry.get("type") == "file")
+            # The next page URL already carries the cursor and query parameters
+            url = resp.links.get("next", {}).get("url")
+            params = None
+        
+        self._space_files[space_id] = files
+        return files
+    
     def _fetch_transformers_js_files(self, username: str, project_name: str) -> Tuple[str, Dict]:
         """Fetch transformers.js files and combine them"""
-        files = {}
+        space_id = f"{username}/{project_name}"
         file_names = ['index.html', 'index.js', 'style.css']
         
-        for file_name in file_names:
-            try:
-                content_path = self.api.hf_hub_download(
-                    repo_id=f"{username}/{project_name}",
-                    filename=file_name,
-                    repo_type="space"
-                )
-                with open(content_path, 'r', encoding='utf-8') as f:
-                    files[file_name] = f.read()
-            except:
-                files[file_name] = ""
+        contents = _FETCH_EXECUTOR.map(lambda name: self._fetch_text("space", space_id, name), file_names)
+        files = {name: content or "" for name, content in zip(file_names, contents)}
         
         # Combine files
         combined = f"""=== index.html ===
@@ -424,45 +646,44 @@ class ProjectImporter:
         """Fetch all relevant files from a space"""
         try:
             space_id = f"{username}/{project_name}"
-            files = list_repo_files(repo_id=space_id, repo_type="space", token=self.hf_token)
+            files = self._list_space_files(space_id)
             
-            # Define file extensions to include
-            include_extensions = {
-                '.py', '.js', '.html', '.css', '.json', '.txt', '.yml', '.yaml',
-                '.toml', '.cfg', '.ini', '.sh', '.md'
-            }
+            # Filter files, stopping once the limit of 50 is reached
+            relevant_files = list(itertools.islice(
+                (
+                    f for f in files
+                    if f.endswith(_INCLUDE_EXTS)
+                    and not f.startswith(('.', '__pycache__'))
+                ),
+                50
+            ))
             
-            # Filter files
-            relevant_files = [
-                f for f in files
-                if any(f.endswith(ext) for ext in include_extensions)
-                and not f.startswith('.')
-                and not f.startswith('__pycache__')
-            ]
-            
-            # Limit number of files
-            if len(relevant_files) > 50:
-                relevant_files = relevant_files[:50]
-            
-            # Fetch file contents
-            file_contents = {}
-            for file in relevant_files:
-                try:
-                    file_path = self.api.hf_hub_download(
-                        repo_id=space_id,
-                        filename=file,
-                        repo_type="space"
-                    )
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_contents[file] = f.read()
-                except:
-                    continue
+            # Fetch file contents concurrently, skipping files that fail to download
+            contents = _FETCH_EXECUTOR.map(lambda file: self._fetch_text("space", space_id, file), relevant_files)
+            file_contents = {
+                file: content
+                for file, content in zip(relevant_files, contents)
+                if content is not None
+            }
             
             return file_contents if file_contents else None
         
         except:
             return None
     
+    def _fetch_text(self, repo_type: str, repo_id: str, path: str) -> Optional[str]:
+        """Fetch a small text file straight from the Hub, without the on-disk download cache"""
+        from huggingface_hub import hf_hub_url
+        
+        try:
+            headers = {"Authorization": f"Bearer {self.hf_token}"} if self.hf_token else {}
+            resp = self._http.get(hf_hub_url(repo_id, path, repo_type=repo_type), headers=headers)
+            if resp.status_code == 200:
+                return resp.content.decode('utf-8')
+        except:
+            pass
+        return None
+    
     def _format_multi_file_content(self, files: Dict[str, str], username: str, project_name: str, sdk: str) -> str:
         """Format multi-file content"""
         header = f"""IMPORTED PROJECT FROM HUGGING FACE SPACE
@@ -474,27 +695,28 @@ Files: {len(files)}
 
 """
         
-        file_sections = []
+        # Write straight into one buffer instead of building a copy of every section
+        buf = io.StringIO()
+        buf.write(header)
+        separator = ""
         for filename, content in files.items():
-            file_sections.append(f"=== {filename} ===\n{content}")
-        
-        return header + "\n\n".join(file_sections)
+            buf.write(separator)
+            buf.write("=== ")
+            buf.write(filename)
+            buf.write(" ===\n")
+            buf.write(content)
+            separator = "\n\n"
+        
+        return buf.getvalue()
     
     def _fetch_main_file(self, username: str, project_name: str, sdk: str) -> Tuple[Optional[str], Optional[str]]:
         """Fetch main file from space"""
         file_patterns = self._get_file_patterns_for_sdk(sdk)
         
         for file_pattern in file_patterns:
-            try:
-                content_path = self.api.hf_hub_download(
-                    repo_id=f"{username}/{project_name}",
-                    filename=file_pattern,
-                    repo_type="space"
-                )
-                with open(content_path, 'r', encoding='utf-8') as f:
-                    return file_pattern, f.read()
-            except:
-                continue
+            content = self._fetch_text("space", f"{username}/{project_name}", file_pattern)
+            if content is not None:
+                return file_pattern, content
         
         return None, None
     
@@ -536,134 +758,71 @@ Files: {len(files)}
         if not pipeline_tag:
             return None
         
-        templates = {
-            "text-generation": f'''import os
-from huggingface_hub import InferenceClient
-
-client = InferenceClient(api_key=os.environ["HF_TOKEN"])
-
-completion = client.chat.completions.create(
-    model="{model_id}",
-    messages=[
-        {{"role": "user", "content": "What is the capital of France?"}}
-    ],
-)
-
-print(completion.choices[0].message)''',
-            
-            "text-to-image": f'''import os
-from huggingface_hub import InferenceClient
-
-client = InferenceClient(api_key=os.environ["HF_TOKEN"])
-
-# output is a PIL.Image object
-image = client.text_to_image(
-    "Astronaut riding a horse",
-    model="{model_id}",
-)
-
-# Save the image
-image.save("output.png")''',
-            
-            "automatic-speech-recognition": f'''import os
-from huggingface_hub import InferenceClient
-
-client = InferenceClient(api_key=os.environ["HF_TOKEN"])
-
-with open("audio.mp3", "rb") as f:
-    audio_data = f.read()
-
-result = client.automatic_speech_recognition(
-    audio_data,
-    model="{model_id}",
-)
-
-print(result)''',
-            
-            "text-to-speech": f'''import os
-from huggingface_hub import InferenceClient
-
-client = InferenceClient(api_key=os.environ["HF_TOKEN"])
-
-audio = client.text_to_speech(
-    "Hello world",
-    model="{model_id}",
-)
-
-# Save the audio
-with open("output.mp3", "wb") as f:
-    f.write(audio)''',
-        }
-        
-        return templates.get(pipeline_tag)
+        template = _INFERENCE_TEMPLATES.get(pipeline_tag)
+        return template.format(model_id=model_id) if template else None
     
     def _fetch_hf_model_readme(self, repo_id: str) -> Optional[str]:
         """Fetch README from HuggingFace model"""
-        try:
-            local_path = self.api.hf_hub_download(
-                repo_id=repo_id,
-                filename="README.md",
-                repo_type="model"
-            )
-            with open(local_path, "r", encoding="utf-8") as f:
-                return f.read()
-        except:
-            return None
+        return _readme_cached(
+            ("hf_model", repo_id, self.hf_token),
+            lambda: self._fetch_text("model", repo_id, "README.md")
+        )
     
     def _fetch_github_readme(self, owner: str, repo: str) -> Optional[str]:
         """Fetch README from GitHub repository"""
+        return _readme_cached(
+            ("github", f"{owner}/{repo}", None),
+            lambda: self._download_github_readme(owner, repo)
+        )
+    
+    def _download_github_readme(self, owner: str, repo: str) -> Optional[str]:
+        """Download README from GitHub, trying the HEAD, main and master branches"""
         urls = [
             f"https://raw.githubusercontent.com/{owner}/{repo}/HEAD/README.md",
             f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md",
             f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md",
         ]
         
-        for url in urls:
-            try:
-                resp = requests.get(url, timeout=10)
-                if resp.status_code == 200 and resp.text:
-                    return resp.text
-            except:
-                continue
+        # Request all candidates at once, but keep the HEAD > main > master preference
+        futures = [_FETCH_EXECUTOR.submit(self._get_text, url) for url in urls]
+        for i, future in enumerate(futures):
+            text = future.result()
+            if text:
+                for pending in futures[i + 1:]:
+                    pending.cancel()
+                return text
         
         return None
     
+    def _get_text(self, url: str) -> Optional[str]:
+        """GET a URL and return its body, or None on failure or an empty response"""
+        try:
+            resp = self._http.get(url, timeout=10)
+            if resp.status_code == 200 and resp.text:
+                return resp.text
+        except:
+            pass
+        return None
+    
     def _extract_code_from_markdown(self, markdown: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract relevant code from markdown"""
         if not markdown:
             return None, None
         
-        # Find all code blocks
-        code_blocks = []
-        for match in re.finditer(r"```([\w+-]+)?\s*\n([\s\S]*?)```", markdown, re.IGNORECASE):
-            lang = (match.group(1) or "").lower()
-            code = match.group(2) or ""
-            code_blocks.append((lang, code.strip()))
-        
-        # Score blocks based on relevance
-        def score_block(code: str) -> int:
-            score = 0
-            keywords = [
-                "from transformers", "import transformers", "pipeline(",
-                "AutoModel", "AutoTokenizer", "text-generation",
-                "from diffusers", "import diffusers", "DiffusionPipeline",
-                "StableDiffusion", "from gradio", "import gradio"
-            ]
-            for kw in keywords:
-                if kw in code:
-                    score += 1
-            score += min(len(code) // 200, 5)
-            return score
-        
-        # Filter and sort
-        relevant = [
-            cb for cb in code_blocks
-            if any(kw in cb[1] for kw in ["transformers", "diffusers", "pipeline(", "gradio", "import"])
-        ]
+        # Score relevant code blocks in one pass; the first block wins ties
+        best_match = None
+        best_code = None
+        best_score = -1
+        for match in _CODE_BLOCK_RE.finditer(markdown):
+            code = (match.group(2) or "").strip()
+            if not _RELEVANT_CODE_RE.search(code):
+                continue
+            score = sum(kw in code for kw in _CODE_SCORE_KEYWORDS) + min(len(code) // 200, 5)
+            if score > best_score:
+                best_match, best_code, best_score = match, code, score
         
-        if relevant:
-            sorted_blocks = sorted(relevant, key=lambda x: score_block(x[1]), reverse=True)
-            return sorted_blocks[0][0] or "python", sorted_blocks[0][1]
+        if best_match is not None:
+            return (best_match.group(1) or "").lower() or "python", best_code
         
         return None, None
     
@@ -672,16 +831,11 @@ with open("output.mp3", "wb") as f:
         if not readme:
             return None
         
-        # Find all code blocks
-        code_blocks = []
-        for match in re.finditer(r"```([\w+-]+)?\s*\n([\s\S]*?)```", readme, re.IGNORECASE):
-            lang = (match.group(1) or "").lower()
-            code = match.group(2) or ""
-            code_blocks.append((lang, code.strip()))
-        
         # Look for JavaScript/TypeScript blocks with Transformers.js code
-        for lang, code in code_blocks:
+        for match in _CODE_BLOCK_RE.finditer(readme):
+            lang = (match.group(1) or "").lower()
             if lang in ('js', 'javascript', 'ts', 'typescript'):
+                code = (match.group(2) or "").strip()
                 # Check if it contains Transformers.js imports
                 if '@huggingface/transformers' in code or '@xenova/transformers' in code:
                     return code
@@ -728,47 +882,52 @@ def main():
     parser = argparse.ArgumentParser(
         description="Import projects from HuggingFace Spaces, Models, or GitHub repos"
     )
-    parser.add_argument("url", help="URL to import from")
-    parser.add_argument("-o", "--output", help="Output file to save code", default=None)
+    parser.add_argument("url", nargs="+", help="URL(s) to import from")
+    parser.add_argument("-o", "--output", help="Output file to save code (single URL only)", default=None)
     parser.add_argument("--prefer-local", action="store_true", 
                        help="Prefer local inference code over serverless (for models)")
     parser.add_argument("--token", help="HuggingFace token", default=None)
     
     args = parser.parse_args()
+    if args.output and len(args.url) > 1:
+        parser.error("--output can only be used with a single URL")
     
     # Initialize importer
     importer = ProjectImporter(hf_token=args.token)
     
-    # Import project
-    print(f"Importing from: {args.url}")
-    print("-" * 60)
-    
-    result = importer.import_from_url(args.url)
-    
-    # Print results
-    print(f"Status: {result['status']}")
-    print(f"Message: {result['message']}")
-    print(f"Language: {result['language']}")
-    print(f"URL: {result['url']}")
-    
-    if result.get('metadata'):
-        print(f"Metadata: {result['metadata']}")
-    
-    print("-" * 60)
+    # Import projects (several URLs are fetched concurrently)
+    if len(args.url) == 1:
+        results = [importer.import_from_url(args.url[0], prefer_local=args.prefer_local)]
+    else:
+        results = importer.import_many(args.url, prefer_local=args.prefer_local)
     
-    if result['code']:
-        if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(result['code'])
-            print(f"Code saved to: {args.output}")
+    for url, result in zip(args.url, results):
+        print(f"Importing from: {url}")
+        print("-" * 60)
+        
+        # Print results
+        print(f"Status: {result['status']}")
+        print(f"Message: {result['message']}")
+        print(f"Language: {result['language']}")
+        print(f"URL: {result['url']}")
+        
+        if result.get('metadata'):
+            print(f"Metadata: {result['metadata']}")
+        
+        print("-" * 60)
+        
+        if result['code']:
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(result['code'])
+                print(f"Code saved to: {args.output}")
+            else:
+                print("Code:")
+                print("=" * 60)
+                print(result['code'])
+                print("=" * 60)
         else:
-            print("Code:")
-            print("=" * 60)
-            print(result['code'])
-            print("=" * 60)
-    else:
-        print("No code to display")
-
+            print("No code to display")
 
 if __name__ == "__main__":
     main()